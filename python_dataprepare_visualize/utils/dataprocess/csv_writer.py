@@ -0,0 +1,42 @@
+from typing import Iterable
+
+import pandas as pd
+
+# 可选依赖：pyarrow 提供C++实现的CSV写出，不可用时回退到 pandas
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+# 写出时的文件缓冲区大小
+WRITE_BUFFER = 4 * 1024 * 1024
+
+# 每批写出的行数（pyarrow 的 batch_size 与 to_csv 的 chunksize 使用同一值）
+_BATCH_ROWS = 1 << 16
+
+
+def write_csv(df: pd.DataFrame, output_path, comment_lines: Iterable[str] = ()) -> None:
+    """
+    将DataFrame写出为CSV（不含索引），优先使用pyarrow，不可用时回退到 to_csv
+
+    两条路径输出一致：字段只在必要时加引号（含分隔符、引号或换行时），换行符为 '\\n'。
+    pyarrow 把整数值的浮点数写成不带小数部分的形式（如 0.0 写为 0），数值可无损读回。
+
+    Args:
+        df: 要写出的DataFrame
+        output_path: 输出文件路径
+        comment_lines: 写在表头之前的文本行（需自带换行符），如元数据注释
+    """
+    if pa is not None:
+        # pyarrow写出二进制流，注释按UTF-8编码后写在前面
+        with open(output_path, 'wb', buffering=WRITE_BUFFER) as f:
+            f.writelines(line.encode('utf-8') for line in comment_lines)
+            pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), f,
+                            write_options=pacsv.WriteOptions(batch_size=_BATCH_ROWS, quoting_style='needed'))
+    else:
+        # newline='' 交由to_csv控制换行符，避免文本模式再次转换
+        with open(output_path, 'w', buffering=WRITE_BUFFER, encoding='utf-8', newline='') as f:
+            f.writelines(comment_lines)
+            df.to_csv(f, index=False, lineterminator='\n', chunksize=_BATCH_ROWS)
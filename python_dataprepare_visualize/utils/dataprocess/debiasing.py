@@ -1,32 +1,100 @@
 import os
-import glob
 import pandas as pd
 import numpy as np
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from loguru import logger
 import sys
 
-def shift_columns_to_zero(df):
+# 可选依赖：pyarrow 提供C实现的CSV读取，不可用时回退到 pandas（CSV写出见csv_writer）
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+try:
+    from .csv_writer import write_csv
+except ImportError:
+    # 作为脚本直接运行时没有父包
+    from csv_writer import write_csv
+
+def shift_columns_to_zero(df, inplace=False):
     """
     处理DataFrame中的每一列，使其第一个值为0
     
     Args:
         df: 输入的DataFrame
+        inplace: 是否直接修改传入的DataFrame（不再额外复制整表）
         
     Returns:
         处理后的DataFrame，每列的第一个值都为0
     """
+    # 只对数值列处理，整块矩阵一次性原地减去第一行（广播）
+    # copy=True 保证不会改写原DataFrame的底层数据，且只分配这一块内存
+    numeric = df.select_dtypes(include=np.number)
+    values = numeric.to_numpy(copy=True)
+    np.subtract(values, values[0].copy(), out=values)
+    shifted = pd.DataFrame(
+        values, columns=numeric.columns, index=df.index, copy=False
+    ).astype(numeric.dtypes.to_dict(), copy=False)  # 保持各列原有dtype
+    
+    if inplace:
+        df[numeric.columns] = shifted
+        return df
+    
+    if len(numeric.columns) == len(df.columns):
+        return shifted
+    
+    # 存在非数值列时保留其原值
     df_shifted = df.copy()
+    df_shifted[numeric.columns] = shifted
+    return df_shifted
+
+def _iter_csvs(input_folder):
+    """
+    逐个产出文件夹中CSV文件的路径（基于os.scandir，扩展名不区分大小写，跳过隐藏文件）
     
-    # 对每一列进行处理
-    for col in df.columns:
-        # 获取该列的第一个值
-        first_val = df[col].iloc[0]
-        # 将该列的所有值减去第一个值
-        df_shifted[col] = df[col] - first_val
+    Args:
+        input_folder: 输入文件夹路径
         
-    return df_shifted
+    Yields:
+        CSV文件路径
+    """
+    with os.scandir(input_folder) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith('.csv') and not entry.name.startswith('.') and entry.is_file():
+                yield entry.path
+
+def _count_rows(file_path, chunk_size=1 << 20):
+    """
+    按1 MiB分块统计CSV文件的数据行数（不含表头）
+    
+    与pd.read_csv一致，空行和只含空白的行不计入
+    
+    Args:
+        file_path: CSV文件路径
+        chunk_size: 每次读取的字节数
+        
+    Returns:
+        数据行数
+    """
+    rows = 0
+    tail = b''
+    with open(file_path, 'rb', buffering=chunk_size) as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            lines = (tail + chunk).split(b'\n')
+            # 最后一段可能是被分块截断的行，留到下一块拼接
+            tail = lines.pop()
+            rows += sum(1 for line in lines if line.strip())
+    
+    # 最后一行没有换行符时也计为一行
+    if tail.strip():
+        rows += 1
+    
+    return max(rows - 1, 0)
 
 def find_min_length(input_folder):
     """
@@ -38,23 +106,17 @@ def find_min_length(input_folder):
     Returns:
         最小行数和对应的文件名
     """
-    # 获取输入文件夹中的所有CSV文件
-    csv_files = glob.glob(os.path.join(input_folder, "*.csv"))
-    
-    if not csv_files:
-        logger.error(f"在 {input_folder} 中没有找到CSV文件")
-        raise ValueError(f"在 {input_folder} 中没有找到CSV文件")
-    
     # 初始化最小行数为一个很大的数
     min_length = float('inf')
     min_file = ""
+    found = False
     
-    # 遍历每个文件，找出最小行数
-    for file_path in csv_files:
+    # 边枚举目录边统计行数，找出最小行数
+    for file_path in _iter_csvs(input_folder):
+        found = True
         try:
-            # 使用pandas读取文件并获取行数
-            df = pd.read_csv(file_path)
-            length = len(df)
+            # 只统计行数，无需解析字段
+            length = _count_rows(file_path)
             
             if length < min_length:
                 min_length = length
@@ -63,10 +125,60 @@ def find_min_length(input_folder):
         except Exception as e:
             logger.error(f"读取文件 {file_path} 时出错: {e}")
     
+    if not found:
+        logger.error(f"在 {input_folder} 中没有找到CSV文件")
+        raise ValueError(f"在 {input_folder} 中没有找到CSV文件")
+    
     logger.info(f"最短文件是 {min_file}，行数为 {min_length}")
     return min_length, min_file
 
-def debias_csv_folder(input_folder, output_folder, truncate_to_min=False):
+def _read_csv(file_path):
+    """
+    读取CSV为DataFrame，优先使用pyarrow的多线程C解析器
+    
+    Args:
+        file_path: CSV文件路径
+        
+    Returns:
+        读取的DataFrame
+    """
+    if pa is not None:
+        table = pacsv.read_csv(file_path, read_options=pacsv.ReadOptions(block_size=1 << 20))
+        return table.to_pandas()
+    return pd.read_csv(file_path)
+
+def _process_one(args):
+    """
+    处理单个CSV文件：读取、按需截断、偏移并保存（进程池工作函数）
+    
+    Args:
+        args: (文件路径, 输出文件夹, 截断长度或None)
+        
+    Returns:
+        (文件路径, 输出路径, 原始行数, 错误信息或None)
+    """
+    file_path, output_folder, min_length = args
+    output_path = os.path.join(output_folder, os.path.basename(file_path))
+    try:
+        # 读取CSV文件
+        df = _read_csv(file_path)
+        original_length = len(df)
+        
+        # 如果需要截断文件（原地删除尾部行，避免产生切片视图）
+        if min_length is not None and original_length > min_length:
+            df.drop(index=df.index[min_length:], inplace=True)
+        
+        # 偏移每列，使第一个值为0；df只在本函数内使用，可以原地修改
+        shift_columns_to_zero(df, inplace=True)
+        
+        # 保存处理后的文件
+        write_csv(df, output_path)
+        return file_path, output_path, original_length, None
+        
+    except Exception as e:
+        return file_path, output_path, 0, str(e)
+
+def debias_csv_folder(input_folder, output_folder, truncate_to_min=False, max_workers=None):
     """
     处理输入文件夹中的所有CSV文件，将每列数据偏移到以第一个值为0
     
@@ -74,12 +186,14 @@ def debias_csv_folder(input_folder, output_folder, truncate_to_min=False):
         input_folder: 包含CSV文件的输入文件夹路径
         output_folder: 处理后文件的输出文件夹路径
         truncate_to_min: 是否将所有文件截断为最短文件的长度
+        max_workers: 并行工作进程数，默认为CPU核数；磁盘较慢时可设得比核数大，
+                     让部分进程读写文件的同时其他进程在计算
     """
     # 确保输出文件夹存在
     os.makedirs(output_folder, exist_ok=True)
     
     # 获取输入文件夹中的所有CSV文件
-    csv_files = glob.glob(os.path.join(input_folder, "*.csv"))
+    csv_files = list(_iter_csvs(input_folder))
     
     if not csv_files:
         logger.warning(f"在 {input_folder} 中没有找到CSV文件")
@@ -93,32 +207,18 @@ def debias_csv_folder(input_folder, output_folder, truncate_to_min=False):
         min_length, min_file = find_min_length(input_folder)
         logger.info(f"将截断所有文件到 {min_length} 行 (与 {min_file} 一致)")
     
-    # 处理每个文件
-    for file_path in csv_files:
-        try:
-            # 获取文件名
+    # 各文件相互独立，使用进程池并行处理，日志统一在主进程输出
+    tasks = [(file_path, output_folder, min_length) for file_path in csv_files]
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        for file_path, output_path, original_length, error in executor.map(_process_one, tasks, chunksize=8):
             file_name = os.path.basename(file_path)
-            logger.info(f"处理文件: {file_name}")
-            
-            # 读取CSV文件
-            df = pd.read_csv(file_path)
-            
-            # 如果需要截断文件
-            if truncate_to_min and len(df) > min_length:
-                logger.info(f"截断文件 {file_name} 从 {len(df)} 行到 {min_length} 行")
-                df = df.iloc[:min_length]
-            
-            # 偏移每列，使第一个值为0
-            df_shifted = shift_columns_to_zero(df)
-            
-            # 保存处理后的文件
-            output_path = os.path.join(output_folder, file_name)
-            df_shifted.to_csv(output_path, index=False)
+            if error is not None:
+                logger.error(f"处理文件 {file_path} 时出错: {error}")
+                continue
             
+            if min_length is not None and original_length > min_length:
+                logger.info(f"截断文件 {file_name} 从 {original_length} 行到 {min_length} 行")
             logger.info(f"已保存到: {output_path}")
-            
-        except Exception as e:
-            logger.error(f"处理文件 {file_path} 时出错: {e}")
     
     logger.info(f"所有文件处理完成。结果保存在: {output_folder}")
 
@@ -128,17 +228,18 @@ def main():
     parser.add_argument('--input', '-i', required=True, help='输入文件夹路径（包含CSV文件）')
     parser.add_argument('--output', '-o', required=True, help='输出文件夹路径（存放处理后的CSV文件）')
     parser.add_argument('--truncate', '-t', action='store_true', help='将所有文件截断为最短文件的长度')
+    parser.add_argument('--workers', '-w', type=int, default=None, help='并行工作进程数（默认为CPU核数）')
     
     args = parser.parse_args()
     
     # 处理文件夹
-    debias_csv_folder(args.input, args.output, truncate_to_min=args.truncate)
+    debias_csv_folder(args.input, args.output, truncate_to_min=args.truncate, max_workers=args.workers)
 
 if __name__ == "__main__":
     logger.configure(
     handlers=[
-        {"sink": sys.stdout, "level": "INFO"},
-        {"sink": "vibration_data_loader.log", "level": "DEBUG", "rotation": "10 MB"},
+        {"sink": sys.stdout, "level": "INFO", "enqueue": True},
+        {"sink": "vibration_data_loader.log", "level": "DEBUG", "rotation": "10 MB", "enqueue": True},
         ]
     )
     input_folder = "./output/data_csv_start-idx-reselected"
@@ -1,10 +1,17 @@
 import os
-import glob
+import csv
+import tempfile
+import hashlib
+import mmap
+import re
+from collections import namedtuple
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button
 import argparse
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 import matplotlib
 import sys
 from loguru import logger
@@ -15,11 +22,337 @@ from loguru import logger
 # logger.add("start_idx_select.log", rotation="10 MB", level="DEBUG")  # 文件日志
 
 # Set up the matplotlib backend explicitly
-matplotlib.use('TkAgg')  # Use TkAgg backend which has good button support
+# QtAgg blits faster than Tk for large line plots; fall back to TkAgg (good button support) without Qt bindings
+try:
+    matplotlib.use('QtAgg')
+except ImportError:
+    matplotlib.use('TkAgg')
+
+# Prefer pandas' multi-threaded pyarrow CSV engine when pyarrow is installed
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    _HAS_PYARROW = True
+except ImportError:
+    pa = None
+    pacsv = None
+    _HAS_PYARROW = False
+_CSV_ENGINE = 'pyarrow' if _HAS_PYARROW else 'c'
+
+# CSV output is shared with the other data-processing scripts
+try:
+    from .csv_writer import write_csv
+except ImportError:
+    # No parent package when run as a script
+    from csv_writer import write_csv
+
+# Number of bytes inspected to detect the table layout of a file
+_SNIFF_BYTES = 8192
+
+# Files above this size are streamed through pyarrow in record batches
+_LARGE_FILE_BYTES = 256 * 1024 * 1024
+
+# Optional JIT for the plot downsampling and text parsing kernels
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Parsed-file cache: kept outside the output folder and pruned (least recently used first) to this size
+_CACHE_FOLDER = os.path.join(tempfile.gettempdir(), 'start_idx_select_cache')
+_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# Points kept per plotted series (about twice the pixel width of the figure)
+_PLOT_POINTS = 2400
+
+
+def _guess_delimiter(file_path):
+    """Most frequent of ',', tab and ';' in the first 4 KiB of a file (',' if none occur)"""
+    with open(file_path, 'rb') as f:
+        head = f.read(4096)
+    counts = {delimiter: head.count(delimiter.encode()) for delimiter in (',', '\t', ';')}
+    best = max(counts, key=counts.get)
+    return best if counts[best] else ','
+
+
+def _header_columns(file_path, delimiter, skip_rows, wanted):
+    """
+    Names from the header row (after skip_rows lines) that are in wanted, in file order.
+    Names are returned exactly as the parsers see them (quotes removed, surrounding spaces
+    kept) and matched after stripping. read_csv's usecols and pyarrow's include_columns reject
+    names missing from a file, so the projection is narrowed per file (a data file and its Vg
+    file have different signal columns). A delimiter of None splits on runs of whitespace.
+    Returns None, reading every column, when none of the wanted names is in the header.
+    """
+    with open(file_path, 'r', errors='replace', newline='') as f:
+        header = next(islice(f, skip_rows, None), '').rstrip('\r\n')
+    names = header.split() if delimiter is None else next(csv.reader([header], delimiter=delimiter), [])
+    columns = [name for name in names if name.strip() in wanted]
+    if not columns:
+        logger.warning(f"{os.path.basename(file_path)} 的表头中没有所选列 {sorted(wanted)}，将读取全部列")
+        return None
+    return columns
+
+
+def _read_csv_arrow(file_path, delimiter=',', include_columns=None):
+    """Read a whole delimited file with pyarrow's multi-threaded C++ tokenizer"""
+    # Excluded columns are skipped by the tokenizer instead of being parsed and dropped
+    convert_options = pacsv.ConvertOptions(
+        include_columns=_header_columns(file_path, delimiter, 0, include_columns) if include_columns else None
+    )
+    table = pacsv.read_csv(file_path,
+                           read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20),
+                           parse_options=pacsv.ParseOptions(delimiter=delimiter),
+                           convert_options=convert_options)
+    # Release Arrow buffers while converting instead of holding both copies
+    data = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
+    return data
+
+
+def _read_csv_streaming(file_path, skip_rows=0, delimiter=',', has_header=True, include_columns=None):
+    """
+    Read a large delimited file batch by batch with pyarrow's streaming reader.
+    The Arrow buffers are released column by column while converting, so the file
+    is never held as a parser buffer and a DataFrame at the same time.
+    """
+    read_options = pacsv.ReadOptions(skip_rows=skip_rows, autogenerate_column_names=not has_header,
+                                     block_size=1 << 22)
+    parse_options = pacsv.ParseOptions(delimiter=delimiter)
+    # Column projection needs header names
+    convert_options = pacsv.ConvertOptions(
+        include_columns=_header_columns(file_path, delimiter, skip_rows, include_columns)
+        if include_columns and has_header else None
+    )
+    with pacsv.open_csv(file_path, read_options=read_options, parse_options=parse_options,
+                        convert_options=convert_options) as reader:
+        table = pa.Table.from_batches(list(reader), schema=reader.schema)
+    data = table.to_pandas(self_destruct=True, split_blocks=True)
+    del table
+    if not has_header:
+        # Match pandas' header=None integer column labels
+        data.columns = range(data.shape[1])
+    return data
+
+
+def _lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: pick n_out sample indices that preserve the visual shape of y(x).
+    The first and last samples are always kept.
+    """
+    n = x.shape[0]
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0] = 0
+    idx[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        # Average of the next bucket is the third triangle vertex
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        idx[i + 1] = a
+    return idx
+
+
+if njit is not None:
+    # nogil lets the prefetch thread downsample the next file while the GUI thread runs
+    _lttb_indices = njit(cache=True, nogil=True)(_lttb_indices)
+
+
+def _is_separator(c, delim):
+    """Bytes that separate fields in the text fallback: the sniffed delimiter, tab, space and '\r'"""
+    return c == delim or c == 9 or c == 32 or c == 13
+
+
+def _is_special(buf, k, t):
+    """Whether buf[k:t] is nan, inf or infinity in any letter case (the words float() accepts)"""
+    n = t - k
+    if n == 3:
+        a = buf[k] | 32
+        b = buf[k + 1] | 32
+        c = buf[k + 2] | 32
+        return (a == 110 and b == 97 and c == 110) or (a == 105 and b == 110 and c == 102)
+    if n == 8:
+        word = (105, 110, 102, 105, 110, 105, 116, 121)  # 'infinity'
+        for i in range(8):
+            if buf[k + i] | 32 != word[i]:
+                return False
+        return True
+    return False
+
+
+def _scan_number(buf, k, end, delim):
+    """
+    Find the token starting at buf[k] (it ends at a separator or at end) and check that it is
+    a decimal/scientific number or nan/inf, i.e. a string float() accepts.
+    Returns (index after the token, whether the token is a number).
+    """
+    t = k
+    while t < end and not _is_separator(buf[t], delim):
+        t += 1
+    i = k
+    if buf[i] == 45 or buf[i] == 43:  # '-' / '+'
+        i += 1
+    if _is_special(buf, i, t):
+        return t, True
+    digits = 0
+    while i < t and 48 <= buf[i] <= 57:
+        digits += 1
+        i += 1
+    if i < t and buf[i] == 46:  # '.'
+        i += 1
+        while i < t and 48 <= buf[i] <= 57:
+            digits += 1
+            i += 1
+    if digits == 0:
+        return t, False
+    if i < t and (buf[i] == 101 or buf[i] == 69):  # 'e' / 'E'
+        i += 1
+        if i < t and (buf[i] == 45 or buf[i] == 43):
+            i += 1
+        exp_digits = 0
+        while i < t and 48 <= buf[i] <= 57:
+            exp_digits += 1
+            i += 1
+        if exp_digits == 0:
+            return t, False
+    return t, i == t
+
+
+def _tokenize_numeric_buffer(buf, skip_lines, delim):
+    """
+    Locate the number tokens of delimited text held in a uint8 buffer, starting after skip_lines lines.
+    Fields are separated by the delim byte; tabs, spaces and '\r' around them are ignored.
+    Blank lines, '#' comments and rows containing a non-numeric field are skipped.
+    Returns (token offsets, token lengths, row index, column index, row count, column count).
+    """
+    n = buf.shape[0]
+    
+    # Locate the first data byte
+    start = 0
+    lines_left = skip_lines
+    while lines_left > 0 and start < n:
+        if buf[start] == 10:
+            lines_left -= 1
+        start += 1
+    
+    # First pass: upper bound on the number of fields
+    n_fields = 0
+    in_field = False
+    for i in range(start, n):
+        c = buf[i]
+        if c == 10 or _is_separator(c, delim):
+            in_field = False
+        elif not in_field:
+            n_fields += 1
+            in_field = True
+    
+    token_starts = np.empty(n_fields, dtype=np.int64)
+    token_lengths = np.empty(n_fields, dtype=np.int64)
+    token_rows = np.empty(n_fields, dtype=np.int64)
+    token_cols = np.empty(n_fields, dtype=np.int64)
+    n_tokens = 0
+    row = 0
+    n_cols = 0
+    i = start
+    while i < n:
+        end = i
+        while end < n and buf[end] != 10:
+            end += 1
+        k = i
+        while k < end and _is_separator(buf[k], delim):
+            k += 1
+        line_tokens = n_tokens
+        col = 0
+        ok = k < end and buf[k] != 35  # '#'
+        while ok and k < end:
+            if _is_separator(buf[k], delim):
+                k += 1
+                continue
+            t, ok = _scan_number(buf, k, end, delim)
+            if ok:
+                token_starts[n_tokens] = k
+                token_lengths[n_tokens] = t - k
+                token_rows[n_tokens] = row
+                token_cols[n_tokens] = col
+                n_tokens += 1
+                col += 1
+            k = t
+        if ok and col > 0:
+            row += 1
+            n_cols = max(n_cols, col)
+        else:
+            n_tokens = line_tokens
+        i = end + 1
+    return (token_starts[:n_tokens], token_lengths[:n_tokens], token_rows[:n_tokens],
+            token_cols[:n_tokens], row, n_cols)
+
+
+def _gather_tokens(buf, token_starts, token_lengths, width):
+    """Copy the located tokens into zero-padded rows of width bytes"""
+    tokens = np.zeros((token_starts.shape[0], width), dtype=np.uint8)
+    for j in range(token_starts.shape[0]):
+        k = token_starts[j]
+        tokens[j, :token_lengths[j]] = buf[k:k + token_lengths[j]]
+    return tokens
+
+
+if njit is not None:
+    _is_separator = njit(cache=True)(_is_separator)
+    _is_special = njit(cache=True)(_is_special)
+    _scan_number = njit(cache=True)(_scan_number)
+    _tokenize_numeric_buffer = njit(cache=True)(_tokenize_numeric_buffer)
+    _gather_tokens = njit(cache=True)(_gather_tokens)
+
+
+def _parse_numeric_buffer(buf, skip_lines, delimiter=','):
+    """
+    Parse delimited numeric text held in a uint8 buffer into a (rows, cols) float array;
+    short rows are padded with NaN.
+    The compiled tokenizer only locates the numbers. The text is converted by numpy's
+    bytes-to-float cast, which rounds exactly like float(), so values are bit-identical
+    to the other read paths. Tokens are padded only to the longest accepted number,
+    so long comments or text fields do not inflate the conversion buffer.
+    """
+    token_starts, token_lengths, token_rows, token_cols, n_rows, n_cols = \
+        _tokenize_numeric_buffer(buf, skip_lines, ord(delimiter))
+    out = np.full((n_rows, n_cols), np.nan)
+    if token_rows.shape[0]:
+        width = int(token_lengths.max())
+        tokens = _gather_tokens(buf, token_starts, token_lengths, width)
+        out[token_rows, token_cols] = tokens.view(f'S{width}').ravel().astype(np.float64)
+    return out
+
+
+# Plotted series of one table: the whole-record LTTB overview (xs, ys, one column per series),
+# the table position of each series, and the full-resolution float32 columns (time first)
+# that the visible window is re-sampled from when zooming
+_DisplaySeries = namedtuple('_DisplaySeries', 'xs ys positions columns time_sorted')
+
+
+def _downsample_for_plot(x, y, n_out=_PLOT_POINTS):
+    """Downsample a series with LTTB for display; short series are returned unchanged"""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if x.shape[0] <= n_out:
+        return x, y
+    idx = _lttb_indices(x, y, n_out)
+    return x[idx], y[idx]
 
 
 class StartIdxVisualizedSelect:
-    def __init__(self, input_folder, output_folder, vg_delay=0.0025):
+    # Strings accepted by float(): decimal/scientific notation plus nan/inf
+    _NUM_RE = re.compile(
+        r'^\s*[+-]?(?:(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|nan|inf(?:inity)?)\s*$',
+        re.IGNORECASE
+    )
+    
+    def __init__(self, input_folder, output_folder, vg_delay=0.0025, include_columns=None):
         """
         Initialize the StartIdxVisualizedSelect class.
         
@@ -29,10 +362,14 @@ class StartIdxVisualizedSelect:
             vg_delay (float): Time offset in seconds to apply to Vg files during reading for signal alignment.
                             This creates a "what you see is what you get" experience where visual alignment 
                             corresponds to actual data alignment. (default: 0.0025s = 2.5ms)
+            include_columns (list): Header names of the columns to read, time column included; other
+                            columns are not parsed and are not written to the trimmed output.
+                            Names missing from a file are ignored. (default: None = all columns)
         """
         self.input_folder = input_folder
         self.output_folder = output_folder
         self.vg_delay = vg_delay
+        self.include_columns = frozenset(include_columns) if include_columns else None
         self.current_file = None
         self.current_vg_file = None  # The Vg file used for visualization
         self.data = None  # Data from original file (for trimming)
@@ -42,6 +379,19 @@ class StartIdxVisualizedSelect:
         self.selected_point = None
         self.line = None
         self.vertical_line = None
+        self.vertical_line2 = None
+        self._background = None  # Cached canvas used to blit the selection lines
+        self._drawing = False  # A full redraw has been requested and not yet rendered
+        self._time_array = None
+        self._time_sorted = False
+        self._vg_plot = None  # _DisplaySeries of the Vg and data tables
+        self._data_plot = None
+        self._plot_lines = {}  # Axes -> [lines, _DisplaySeries, plotted (start, stop) sample window]
+        self._layouts = {}  # (folder, extension) -> last (skip_rows, delimiter, has_header) that parsed
+        
+        # Background reader for the next file pair
+        self._pool = ThreadPoolExecutor(max_workers=2)
+        self._prefetch = None  # (file_path, data_future, vg_future)
         self.files_to_process = []
         self.current_file_index = 0
         self.btn_next = None
@@ -55,38 +405,26 @@ class StartIdxVisualizedSelect:
         self.original_ylim_ax2 = None
         self.press_event = None
         
-        # Find all TXT and CSV files in the input folder
-        txt_files = glob.glob(os.path.join(self.input_folder, "*.txt"))
-        csv_files = glob.glob(os.path.join(self.input_folder, "*.csv"))
-        all_files = txt_files + csv_files
+        # Create the output folder if it doesn't exist (it also holds the file-list cache)
+        os.makedirs(self.output_folder, exist_ok=True)
+        
+        # Find all TXT and CSV files in the input folder (cached between runs)
+        names = set(self._list_input_files())
         
         # Filter to only include files that have corresponding Vg files
         # Look for pairs: original file (e.g., "11.txt") and Vg file (e.g., "11V.txt")
         self.files_to_process = []
-        vg_files = set()
-        
-        # First, identify all Vg files
-        for file_path in all_files:
-            filename = os.path.basename(file_path)
-            if filename.endswith('V.txt') or filename.endswith('V.csv'):
-                vg_files.add(file_path)
-        
-        # Then, find original files that have corresponding Vg files
-        for file_path in all_files:
-            filename = os.path.basename(file_path)
-            file_ext = os.path.splitext(filename)[1]
-            
+        for filename in sorted(names):
             # Skip if this is already a Vg file
-            if filename.endswith('V.txt') or filename.endswith('V.csv'):
+            if filename.endswith(('V.txt', 'V.csv')):
                 continue
-                
+            
             # Look for corresponding Vg file
-            base_name = os.path.splitext(filename)[0]
+            base_name, file_ext = os.path.splitext(filename)
             vg_filename = base_name + 'V' + file_ext
-            vg_file_path = os.path.join(self.input_folder, vg_filename)
             
-            if vg_file_path in vg_files:
-                self.files_to_process.append(file_path)
+            if vg_filename in names:
+                self.files_to_process.append(os.path.join(self.input_folder, filename))
                 logger.info(f"找到配对文件: {filename} <-> {vg_filename}")
             else:
                 logger.warning(f"未找到对应的Vg文件: {filename}")
@@ -94,160 +432,331 @@ class StartIdxVisualizedSelect:
         logger.info(f"找到 {len(self.files_to_process)} 个有Vg配对的数据文件")
         logger.info(f"Vg信号延时设置: {self.vg_delay*1000:.1f}ms")
         
-        # Create the output folder if it doesn't exist
-        os.makedirs(self.output_folder, exist_ok=True)
+        # Parsed-file cache lives in the temp directory, not in the deliverable output folder
+        self.cache_folder = _CACHE_FOLDER
+        if _HAS_PYARROW:
+            os.makedirs(self.cache_folder, exist_ok=True)
+            self._prune_cache()
         
         # Configure matplotlib to use interactive mode
         plt.ion()
     
+    def _list_input_files(self):
+        """
+        Names of the TXT and CSV files in the input folder.
+        
+        The listing is cached in the temp cache folder (one file per input folder, named by
+        a hash of its path) together with the input folder's modification time; adding,
+        removing or renaming files changes that time, so an unchanged folder is not
+        scanned again on the next run. A missing input folder has no files, so run()
+        reports that instead of failing here.
+        """
+        if not os.path.isdir(self.input_folder):
+            return []
+        input_folder = os.path.abspath(self.input_folder)
+        key = hashlib.blake2b(input_folder.encode(), digest_size=8).hexdigest()
+        cache_file = os.path.join(_CACHE_FOLDER, key + '.files.txt')
+        stamp = f"{input_folder}\t{os.stat(input_folder).st_mtime_ns}"
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = f.read().split('\n')
+            if cached[0] == stamp:
+                return [name for name in cached[1:] if name]
+        except OSError:
+            pass
+        
+        # Single directory pass
+        with os.scandir(self.input_folder) as it:
+            names = sorted(entry.name for entry in it
+                           if entry.name.endswith(('.txt', '.csv')) and not entry.name.startswith('.')
+                           and entry.is_file())
+        try:
+            os.makedirs(_CACHE_FOLDER, exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                f.write('\n'.join([stamp] + names))
+        except OSError as e:
+            logger.debug(f"写入文件列表缓存失败: {e}")
+        return names
+    
     def read_data_file(self, file_path):
         """
         Read data from a file (TXT or CSV) using standard parsing.
         Automatically applies vg_delay to Vg files (files ending with 'V.txt' or 'V.csv').
+        Parsed tables are cached on disk so revisiting a file skips re-parsing.
         """
-        file_ext = os.path.splitext(file_path)[1].lower()
         filename = os.path.basename(file_path)
         is_vg_file = filename.endswith('V.txt') or filename.endswith('V.csv')
         
         try:
-            # If it's a CSV file, try to read it directly first
-            if file_ext == '.csv':
-                try:
-                    data = pd.read_csv(file_path)
-                    if not data.empty:
-                        logger.info(f"成功读取CSV文件: {file_path}")
-                        
-                        # Apply time delay to Vg files for signal alignment
-                        if is_vg_file and self.vg_delay != 0:
-                            time_col = data.columns[0]
-                            data[time_col] = data[time_col] + self.vg_delay
-                            logger.debug(f"已对Vg文件应用 {self.vg_delay*1000:.1f}ms 时间偏移")
-                        
-                        return data
-                except Exception as e:
-                    logger.warning(f"无法正常读取CSV文件，尝试替代方法: {e}")
+            data = self._load_cached(file_path)
+            if data is None:
+                data = self._parse_data_file(file_path)
+                if data is None:
+                    return None
+                self._store_cached(file_path, data)
             
-            # Try to read as CSV with different delimiters
-            for delimiter in [',', '\t', ' ']:
-                try:
-                    data = pd.read_csv(file_path, delimiter=delimiter, header=None)
-                    if not data.empty:
-                        # Check if we need to skip rows (metadata or headers)
-                        if data.iloc[0].apply(lambda x: isinstance(x, str) and ':' in str(x)).any():
-                            # There might be metadata with colon, try to skip these rows
-                            for i in range(10):  # Try different header rows
-                                try:
-                                    data = pd.read_csv(file_path, delimiter=delimiter, header=i)
-                                    # Check if this worked by seeing if we have numeric data
-                                    if data.select_dtypes(include=[np.number]).shape[1] > 0:
-                                        logger.debug(f"使用分隔符'{delimiter}'和头行{i}成功读取{file_path}")
-                                        
-                                        # Apply time delay to Vg files for signal alignment
-                                        if is_vg_file and self.vg_delay != 0:
-                                            time_col = data.columns[0]
-                                            data[time_col] = data[time_col] + self.vg_delay
-                                            logger.debug(f"已对Vg文件应用 {self.vg_delay*1000:.1f}ms 时间偏移")
-                                        
-                                        return data
-                                except:
-                                    continue
-                        
-                        # If the data looks good, return it
-                        logger.debug(f"使用分隔符'{delimiter}'成功读取{file_path}")
-                        
-                        # Try to convert all columns to numeric
-                        for col in data.columns:
-                            data[col] = pd.to_numeric(data[col], errors='ignore')
-                        
-                        # Apply time delay to Vg files for signal alignment
-                        if is_vg_file and self.vg_delay != 0:
-                            time_col = data.columns[0]
-                            data[time_col] = data[time_col] + self.vg_delay
-                            logger.debug(f"已对Vg文件应用 {self.vg_delay*1000:.1f}ms 时间偏移")
-                            
-                        return data
-                except Exception as e:
-                    logger.debug(f"使用分隔符'{delimiter}'失败: {e}")
-                    continue
-            
-            # If that fails, read as plain text
-            with open(file_path, 'r') as f:
-                lines = f.readlines()
-            
-            # Try to parse lines into numeric data
-            data_rows = []
-            header_row = None
-            
-            # Find where the data starts (after metadata)
-            start_idx = 0
-            for i, line in enumerate(lines):
-                if ':' in line or line.startswith('#'):  # This is likely metadata or comment
-                    start_idx = i + 1
+            # The cache holds the raw table; the Vg delay is applied on every read
+            return self._apply_vg_delay(data, is_vg_file)
+        
+        except Exception as e:
+            logger.error(f"读取文件{file_path}时出错: {e}")
+            return None
+    
+    def _usecols(self, file_path, delimiter, skip_rows, has_header):
+        """read_csv usecols for include_columns (None reads every column; projection needs a header)"""
+        if self.include_columns is None or not has_header:
+            return None
+        return _header_columns(file_path, delimiter, skip_rows, self.include_columns)
+    
+    @property
+    def _columns_key(self):
+        """Column projection as part of the cache key; a different selection must not hit the cache"""
+        return ','.join(sorted(self.include_columns)) if self.include_columns else '*'
+    
+    def _cache_path(self, file_path):
+        """Cache file for a data file, keyed on its path, size and modification time"""
+        stat = os.stat(file_path)
+        key = hashlib.blake2b(
+            f"{os.path.abspath(file_path)}:{stat.st_mtime_ns}:{stat.st_size}:{self._columns_key}".encode(),
+            digest_size=8
+        ).hexdigest()
+        return os.path.join(self.cache_folder, key + '.feather')
+    
+    def _load_cached(self, file_path):
+        """Return the cached table for a file, or None if there is no valid cache entry"""
+        if not _HAS_PYARROW:
+            return None
+        cache_path = self._cache_path(file_path)
+        if not os.path.exists(cache_path):
+            return None
+        try:
+            data = pd.read_feather(cache_path)
+            # Touch the entry so pruning drops the least recently used tables first
+            os.utime(cache_path)
+            logger.debug(f"从缓存读取 {file_path}")
+            return data
+        except Exception as e:
+            logger.debug(f"读取缓存 {cache_path} 失败: {e}")
+            return None
+    
+    def _prune_cache(self, max_bytes=_CACHE_MAX_BYTES):
+        """
+        Delete the least recently used cache entries until the cache fits in max_bytes.
+        Entries of edited or removed input files are never hit again, so they age out here.
+        """
+        try:
+            with os.scandir(self.cache_folder) as it:
+                entries = [(entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                           for entry in it if entry.name.endswith('.feather') and entry.is_file()]
+        except OSError as e:
+            logger.debug(f"扫描缓存目录失败: {e}")
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError as e:
+                logger.debug(f"删除缓存 {path} 失败: {e}")
+    
+    def _store_cached(self, file_path, data):
+        """Write a parsed table to the cache (Feather needs string column names)"""
+        if not _HAS_PYARROW or not all(isinstance(col, str) for col in data.columns):
+            return
+        try:
+            data.reset_index(drop=True).to_feather(self._cache_path(file_path))
+        except Exception as e:
+            logger.debug(f"写入缓存失败 {file_path}: {e}")
+    
+    def _parse_data_file(self, file_path):
+        """Parse a data file into a DataFrame without applying the Vg delay"""
+        file_ext = os.path.splitext(file_path)[1].lower()
+        streaming = _HAS_PYARROW and os.path.getsize(file_path) > _LARGE_FILE_BYTES
+        
+        # If it's a CSV file, try to read it directly first
+        if file_ext == '.csv':
+            try:
+                if streaming:
+                    data = _read_csv_streaming(file_path, delimiter=_guess_delimiter(file_path),
+                                               include_columns=self.include_columns)
+                elif _HAS_PYARROW:
+                    data = _read_csv_arrow(file_path, _guess_delimiter(file_path), self.include_columns)
                 else:
+                    data = pd.read_csv(file_path, usecols=self._usecols(file_path, ',', 0, True))
+                if not data.empty:
+                    logger.info(f"成功读取CSV文件: {file_path}")
+                    return data
+            except Exception as e:
+                logger.warning(f"无法正常读取CSV文件，尝试替代方法: {e}")
+        
+        # Files in one folder share their layout: try the one detected for the previous file first,
+        # and only sniff this file's head when that does not give a fully numeric table
+        layout_key = (os.path.dirname(os.path.abspath(file_path)), file_ext)
+        cached_layout = self._layouts.get(layout_key)
+        if cached_layout is not None:
+            data = self._read_with_layout(file_path, cached_layout, streaming)
+            if data is not None:
+                return data
+        
+        # Detect metadata rows, delimiter and header once, then parse the file in a single pass
+        layout = self._sniff_layout(file_path)
+        if layout != cached_layout:
+            data = self._read_with_layout(file_path, layout, streaming)
+            if data is not None:
+                self._layouts[layout_key] = layout
+                return data
+        
+        # If that fails, read as plain text
+        delimiter = layout[1]
+        # Only the head is held as lines (to find metadata and header); data rows are parsed from the file itself
+        with open(file_path, 'r') as f:
+            lines = f.readlines(_SNIFF_BYTES)
+        
+        # Try to parse lines into numeric data
+        data_rows = []
+        header_row = None
+        
+        # Find where the data starts (after metadata)
+        start_idx = 0
+        for i, line in enumerate(lines):
+            if ':' in line or line.startswith('#'):  # This is likely metadata or comment
+                start_idx = i + 1
+            else:
+                break
+        
+        # Look for header row
+        for i in range(start_idx, min(start_idx + 3, len(lines))):
+            if i < len(lines):
+                parts = lines[i].strip().split()
+                # If this line has text parts, it's likely a header
+                if not all(map(self._NUM_RE.match, parts)):
+                    header_row = i
                     break
-            
-            # Look for header row
-            for i in range(start_idx, min(start_idx + 3, len(lines))):
-                if i < len(lines):
-                    parts = lines[i].strip().split()
-                    # If this line has text parts, it's likely a header
-                    if any(not self._is_number(part) for part in parts):
-                        header_row = i
-                        break
-            
-            # Skip header and process data rows
-            for i in range(header_row + 1 if header_row is not None else start_idx, len(lines)):
-                line = lines[i].strip()
-                if not line or line.startswith('#'):
-                    continue
-                
-                try:
-                    # Try different delimiters
-                    for delimiter in [',', '\t', ' ']:
-                        parts = line.split(delimiter)
-                        values = [float(part) for part in parts if part.strip()]
+        
+        # Skip header and process data rows
+        first_data_line = header_row + 1 if header_row is not None else start_idx
+        if njit is not None:
+            # Compiled tokenizer over the memory-mapped bytes (no read copy, no decode); yields a (rows, cols) float array
+            if os.path.getsize(file_path) > 0:
+                with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    buf = np.frombuffer(mm, dtype=np.uint8)
+                    data_rows = _parse_numeric_buffer(buf, first_data_line, delimiter)
+                    del buf  # the map cannot close while an array still exports it
+        else:
+            # Bulk-load the rectangular case with the sniffed delimiter (None = runs of whitespace)
+            try:
+                data_rows = np.loadtxt(file_path, delimiter=None if delimiter == ' ' else delimiter,
+                                       skiprows=first_data_line, comments='#', ndmin=2)
+            except ValueError:
+                # Ragged or partly non-numeric rows: stream the file line by line and keep what converts,
+                # splitting on the sniffed delimiter only
+                sep = None if delimiter == ' ' else delimiter
+                with open(file_path, 'r', buffering=1 << 20) as f:
+                    for line in islice(f, first_data_line, None):
+                        line = line.strip()
+                        if not line or line.startswith('#'):
+                            continue
+                        
+                        try:
+                            values = [float(part) for part in line.split(sep) if part.strip()]
+                        except ValueError:
+                            # Not a data row
+                            continue
                         if values:
                             data_rows.append(values)
-                            break
-                except ValueError:
-                    # Not a data row
-                    continue
-            
-            if not data_rows:
-                logger.warning(f"在{file_path}中未找到数值数据")
-                return None
-            
-            # Create DataFrame from parsed data
-            df = pd.DataFrame(data_rows)
-            
-            # Try to add column headers if available
-            if header_row is not None:
-                header_parts = lines[header_row].strip().split()
-                if len(header_parts) == len(df.columns):
-                    df.columns = header_parts
-            
-            logger.info(f"成功解析文本文件 {file_path}")
-            
-            # Apply time delay to Vg files for signal alignment
-            if is_vg_file and self.vg_delay != 0:
-                time_col = df.columns[0]
-                df[time_col] = df[time_col] + self.vg_delay
-                logger.debug(f"已对Vg文件应用 {self.vg_delay*1000:.1f}ms 时间偏移")
-            
-            return df
         
-        except Exception as e:
-            logger.error(f"读取文件{file_path}时出错: {e}")
+        if len(data_rows) == 0:
+            logger.warning(f"在{file_path}中未找到数值数据")
             return None
+        
+        # Create DataFrame from parsed data
+        df = pd.DataFrame(data_rows)
+        
+        # Try to add column headers if available
+        if header_row is not None:
+            header_parts = lines[header_row].strip().split()
+            if len(header_parts) == len(df.columns):
+                df.columns = header_parts
+        
+        logger.info(f"成功解析文本文件 {file_path}")
+        
+        return df
     
+    def _read_with_layout(self, file_path, layout, streaming):
+        """
+        Parse a file with a known (skip_rows, delimiter, has_header) layout.
+        Returns the table only if every column parsed as numbers, otherwise None.
+        """
+        skip_rows, delimiter, has_header = layout
+        try:
+            if delimiter == ' ':
+                # Runs of spaces: only the C engine understands a regex separator
+                data = pd.read_csv(file_path, sep=r'\s+', skiprows=skip_rows,
+                                   header=0 if has_header else None, engine='c',
+                                   usecols=self._usecols(file_path, None, skip_rows, has_header))
+            elif streaming:
+                data = _read_csv_streaming(file_path, skip_rows, delimiter, has_header, self.include_columns)
+            else:
+                data = pd.read_csv(file_path, sep=delimiter, skiprows=skip_rows,
+                                   header=0 if has_header else None, engine=_CSV_ENGINE,
+                                   usecols=self._usecols(file_path, delimiter, skip_rows, has_header))
+            
+            if not data.empty:
+                # read_csv already inferred the column dtypes; only leftover object columns need another look
+                # (infer_objects copies the frame, so skip it when every column is already typed)
+                if (data.dtypes == object).any():
+                    data = data.infer_objects()
+                
+                # Only accept the result if every column parsed as numbers (checked on dtypes, no cell scan or copy)
+                if all(pd.api.types.is_numeric_dtype(dtype) for dtype in data.dtypes):
+                    logger.debug(f"使用分隔符'{delimiter}'和跳过{skip_rows}行成功读取{file_path}")
+                    return data
+        except Exception as e:
+            logger.debug(f"使用分隔符'{delimiter}'解析失败: {e}")
+        return None
     
-    def _is_number(self, s):
-        """Check if string can be converted to a number"""
+    def _sniff_layout(self, file_path):
+        """
+        Inspect the head of a file to find where its table starts.
+        
+        Returns:
+            tuple: (number of leading metadata/comment rows, delimiter, whether a header row follows)
+        """
+        with open(file_path, 'r', errors='replace') as f:
+            sample_lines = f.readlines(_SNIFF_BYTES)
+        
+        # Leading metadata ("key: value") or comment lines
+        skip_rows = 0
+        for line in sample_lines:
+            if ':' in line or line.startswith('#'):
+                skip_rows += 1
+            else:
+                break
+        
+        body = [line for line in sample_lines[skip_rows:] if line.strip()]
+        if not body:
+            return skip_rows, ',', False
+        
         try:
-            float(s)
-            return True
-        except ValueError:
-            return False
+            delimiter = csv.Sniffer().sniff(''.join(body), delimiters=',\t; ').delimiter
+        except csv.Error:
+            delimiter = ' '
+        
+        first_line = body[0].strip()
+        parts = first_line.split() if delimiter == ' ' else first_line.split(delimiter)
+        # The number pattern already tolerates surrounding whitespace, so tokens are matched as-is
+        has_header = not all(map(self._NUM_RE.match, filter(str.strip, parts)))
+        return skip_rows, delimiter, has_header
+    
+    def _apply_vg_delay(self, data, is_vg_file):
+        """Apply the time delay to Vg files for signal alignment"""
+        if is_vg_file and self.vg_delay != 0:
+            time_col = data.columns[0]
+            data[time_col] = data[time_col] + self.vg_delay
+            logger.debug(f"已对Vg文件应用 {self.vg_delay*1000:.1f}ms 时间偏移")
+        return data
     
     def on_click(self, event):
         """Handle mouse click event to select a new starting point"""
@@ -260,18 +769,41 @@ class StartIdxVisualizedSelect:
         # Store the exact x-coordinate of the click
         self.selected_point = event.xdata
         
-        # Update the vertical lines on both subplots
-        if self.vertical_line:
-            self.vertical_line.remove()
-        if hasattr(self, 'vertical_line2') and self.vertical_line2:
-            self.vertical_line2.remove()
-            
-        self.vertical_line = self.ax.axvline(x=self.selected_point, color='r', linestyle='--', linewidth=2, alpha=0.8)
-        if hasattr(self, 'ax2'):
-            self.vertical_line2 = self.ax2.axvline(x=self.selected_point, color='r', linestyle='--', linewidth=2, alpha=0.8)
+        # Move the persistent vertical lines on both subplots
+        self.vertical_line.set_xdata([self.selected_point, self.selected_point])
+        self.vertical_line2.set_xdata([self.selected_point, self.selected_point])
         
-        # Redraw the canvas
-        self.fig.canvas.draw_idle()
+        # Blit only the two lines over the cached background instead of redrawing the signals
+        if self._background is None:
+            # No background yet: request one full redraw; further clicks only move the lines
+            # until it has rendered, so draw requests cannot pile up in the GUI event queue
+            if not self._drawing:
+                self._drawing = True
+                self.fig.canvas.draw_idle()
+            return
+        self.fig.canvas.restore_region(self._background)
+        self._draw_selection_lines()
+        # Only the two plot areas changed; buttons and instruction text are not re-sent to the GUI
+        self.fig.canvas.blit(self.ax.bbox)
+        self.fig.canvas.blit(self.ax2.bbox)
+    
+    def _create_selection_lines(self):
+        """Create the (initially hidden) selection lines; they are animated so blitting can redraw them alone"""
+        line_style = dict(color='r', linestyle='--', linewidth=2, alpha=0.8, animated=True)
+        self.vertical_line = self.ax.axvline(x=np.nan, **line_style)
+        self.vertical_line2 = self.ax2.axvline(x=np.nan, **line_style)
+        self._background = None
+    
+    def _draw_selection_lines(self):
+        """Draw the animated selection lines on top of the current canvas"""
+        self.ax.draw_artist(self.vertical_line)
+        self.ax2.draw_artist(self.vertical_line2)
+    
+    def _on_draw(self, event):
+        """After every full redraw (zoom, pan, resize) re-capture the background for blitting"""
+        self._background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self._drawing = False
+        self._draw_selection_lines()
     
     def _combined_button_press(self, event):
         """Combined handler for button press events"""
@@ -404,11 +936,8 @@ class StartIdxVisualizedSelect:
         # Note: Both signals are now aligned in time domain, so we can directly use the selected point
         if isinstance(self.data, pd.DataFrame):
             # If using DataFrame with time as first column
-            time_col = self.data.columns[0]
-            time_array = self.data[time_col].values
-            
             # Find the index of the closest time value
-            closest_idx = np.abs(time_array - self.selected_point).argmin()
+            closest_idx = self._nearest_time_index(self.selected_point)
             logger.debug(f"选择的时间: {self.selected_point}, 最近的索引: {closest_idx} (在原始数据文件中)")
             
             # Trim the data from this index
@@ -426,10 +955,27 @@ class StartIdxVisualizedSelect:
         output_file = os.path.join(self.output_folder, file_name_without_ext + ".csv")
         
         # Save as CSV with headers
-        trimmed_data.to_csv(output_file, index=False)
+        if isinstance(trimmed_data, pd.DataFrame):
+            write_csv(trimmed_data, output_file)
+        else:
+            pd.DataFrame(trimmed_data).to_csv(output_file, index=False)
         logger.success(f"已保存截断数据到 {output_file} (基于视觉对齐选择的起始点)")
         return True
     
+    def _nearest_time_index(self, t):
+        """Index of the sample in self.data whose time is closest to t"""
+        time_array = self._time_array
+        if not self._time_sorted:
+            return int(np.abs(time_array - t).argmin())
+        
+        # Binary search on the monotonic time axis, then pick the nearer neighbour
+        pos = int(np.searchsorted(time_array, t))
+        if pos == 0:
+            return 0
+        if pos == len(time_array):
+            return len(time_array) - 1
+        return pos - 1 if (t - time_array[pos - 1]) <= (time_array[pos] - t) else pos
+    
     def on_next(self, event=None):
         """Process the current file and move to the next one"""
         logger.info("点击保存并下一个按钮")
@@ -479,6 +1025,41 @@ class StartIdxVisualizedSelect:
             # 'r' key for reset view
             self.reset_view()
     
+    def _vg_path(self, file_path):
+        """Path of the Vg file paired with a data file (e.g. '11.txt' -> '11V.txt')"""
+        base_name, file_ext = os.path.splitext(os.path.basename(file_path))
+        return os.path.join(self.input_folder, base_name + 'V' + file_ext)
+    
+    def _prefetch_next(self):
+        """Submit background reads of the next data/Vg pair"""
+        if self.current_file_index >= len(self.files_to_process):
+            self._prefetch = None
+            return
+        next_file = self.files_to_process[self.current_file_index]
+        self._prefetch = (
+            next_file,
+            self._pool.submit(self._read_for_display, next_file),
+            self._pool.submit(self._read_for_display, self._vg_path(next_file)),
+        )
+    
+    def _read_for_display(self, file_path):
+        """Read a file and prepare its downsampled display series, returning (data, series)"""
+        data = self.read_data_file(file_path)
+        if data is None or len(data) == 0:
+            return data, None
+        return data, self._display_series(data)
+    
+    def _take_prefetched(self, file_path):
+        """
+        Return ((data, series), (vg_data, vg_series)) for a file, using the background work
+        if it was for this file
+        """
+        if self._prefetch is not None and self._prefetch[0] == file_path:
+            _, data_future, vg_future = self._prefetch
+            self._prefetch = None
+            return data_future.result(), vg_future.result()
+        return self._read_for_display(file_path), self._read_for_display(self._vg_path(file_path))
+    
     def process_next_file(self):
         """Process the next file in the list"""
         if self.current_file_index >= len(self.files_to_process):
@@ -492,19 +1073,18 @@ class StartIdxVisualizedSelect:
         self.selected_point = None
         
         # Generate corresponding Vg file path
-        filename = os.path.basename(self.current_file)
-        base_name = os.path.splitext(filename)[0]
-        file_ext = os.path.splitext(filename)[1]
-        vg_filename = base_name + 'V' + file_ext
-        self.current_vg_file = os.path.join(self.input_folder, vg_filename)
+        self.current_vg_file = self._vg_path(self.current_file)
         
         logger.info(f"正在处理文件: {self.current_file}")
         logger.info(f"对应的Vg文件: {self.current_vg_file}")
         
-        # Read both the original data and the Vg data
+        # Read both the original data and the Vg data (prefetched while the previous file was shown)
         # Note: Vg data will automatically have time offset applied during reading
-        self.data = self.read_data_file(self.current_file)
-        self.vg_data = self.read_data_file(self.current_vg_file)
+        # The display series were downsampled on the same background thread
+        (self.data, self._data_plot), (self.vg_data, self._vg_plot) = self._take_prefetched(self.current_file)
+        
+        # Start reading the following pair in the background while the user inspects this one
+        self._prefetch_next()
         
         if self.data is None or len(self.data) == 0:
             logger.warning(f"文件 {self.current_file} 中没有有效数据，跳过...")
@@ -516,29 +1096,27 @@ class StartIdxVisualizedSelect:
             self.process_next_file()
             return
         
-        # Close any existing figure
-        if self.fig is not None:
-            plt.close(self.fig)
-        
-        # Create a new figure with two subplots
-        self.fig, (self.ax, self.ax2) = plt.subplots(2, 1, figsize=(12, 10), sharex=True)
-        
-        # Create buttons
-        self.create_buttons()
-        
-        # Connect all mouse and keyboard events
-        self.fig.canvas.mpl_connect('button_press_event', self._combined_button_press)
-        self.fig.canvas.mpl_connect('scroll_event', self.on_scroll)
-        self.fig.canvas.mpl_connect('motion_notify_event', self.on_motion)
-        self.fig.canvas.mpl_connect('button_release_event', self.on_release)
+        # Time axis of the data file, extracted once for nearest-index lookups when saving
+        if isinstance(self.data, pd.DataFrame):
+            self._time_array = self.data.iloc[:, 0].to_numpy()
+            self._time_sorted = bool(np.all(np.diff(self._time_array) >= 0))
         
-        # Reset vertical lines
-        self.vertical_line = None
-        self.vertical_line2 = None
+        # The figure, buttons and event bindings are created once and reused for every file
+        new_figure = self.fig is None or not plt.fignum_exists(self.fig.number)
+        if new_figure:
+            self._create_figure()
+        else:
+            # Clearing the axes also removes the previous file's selection lines
+            self._plot_lines.clear()
+            self.ax.clear()
+            self.ax2.clear()
         
         # Plot both Vg data and original data
         self._plot_both_signals()
         
+        # Selection lines are created once per file (ax.clear removed the old ones) and moved on click
+        self._create_selection_lines()
+        
         # Set titles
         delay_info = f"延时{self.vg_delay*1000:.1f}ms" if self.vg_delay != 0 else "无延时"
         self.ax.set_title(f"Vg Signal: {os.path.basename(self.current_vg_file)} ({delay_info})")
@@ -552,110 +1130,147 @@ class StartIdxVisualizedSelect:
         self.original_ylim_ax = self.ax.get_ylim()
         self.original_ylim_ax2 = self.ax2.get_ylim()
         
+        # Show the window once; later files only redraw the already visible canvas
+        # (showing again would re-raise the window and take keyboard focus on every file).
+        # Pending GUI events are processed once instead of sleeping in plt.pause;
+        # the blocking plt.show() in run() keeps the event loop going afterwards
+        if new_figure:
+            plt.show(block=False)  # Non-blocking show
+        self.fig.canvas.draw_idle()
+        self.fig.canvas.flush_events()
+    
+    def _create_figure(self):
+        """Create the figure with its two subplots, buttons, instructions and event bindings"""
+        # Create a new figure with two subplots
+        self.fig, (self.ax, self.ax2) = plt.subplots(2, 1, figsize=(12, 10), sharex=True)
+        
+        # Create buttons
+        self.create_buttons()
+        
+        # Connect all mouse and keyboard events
+        self.fig.canvas.mpl_connect('button_press_event', self._combined_button_press)
+        self.fig.canvas.mpl_connect('scroll_event', self.on_scroll)
+        self.fig.canvas.mpl_connect('motion_notify_event', self.on_motion)
+        self.fig.canvas.mpl_connect('button_release_event', self.on_release)
+        self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+        # Scroll, pan, reset and toolbar zoom all go through set_xlim
+        for ax in (self.ax, self.ax2):
+            ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+        
         # Show instructions
         plt.figtext(0.5, 0.10, "Click to select starting point. Scroll wheel: zoom | Shift+drag: pan | 'r': reset view", 
                    ha='center', fontsize=9)
         plt.figtext(0.5, 0.07, "Keys: 'n' = save & next | 'k' = skip | 'r' = reset view", 
                    ha='center', fontsize=8)
-        
-        # Show the plot
-        self.fig.canvas.draw()
-        plt.show(block=False)  # Non-blocking show
-        plt.pause(0.1)  # Small pause to ensure the window shows
     
     def _plot_both_signals(self):
         """Plot both Vg data and original data on separate subplots"""
+        # Series are LTTB-downsampled for display only (and re-sampled per visible window on zoom);
+        # self.data keeps every sample for trimming
         # Plot Vg data on the first subplot (self.ax)
         if isinstance(self.vg_data, pd.DataFrame):
-            time_col = self.vg_data.columns[0]
-            x_values = self.vg_data[time_col]
-            
-            for col in self.vg_data.columns[1:]:
-                try:
-                    self.ax.plot(x_values, self.vg_data[col], label=f"Vg - {str(col)}", color='blue', linewidth=1.5)
-                except Exception as e:
-                    logger.error(f"绘制Vg列 {col} 时出错: {e}")
+            labels = [f"Vg - {str(col)}" for col in self.vg_data.columns[1:]]
         else:
-            x_values = self.vg_data[:, 0]
-            for col in range(1, self.vg_data.shape[1]):
-                self.ax.plot(x_values, self.vg_data[:, col], label=f"Vg - Column {col+1}", color='blue', linewidth=1.5)
+            labels = [f"Vg - Column {col+1}" for col in range(1, self.vg_data.shape[1])]
+        self._plot_columns(self.ax, self._vg_plot, labels, color='blue')
         
         self.ax.set_ylabel("Voltage (Vg)")
         self.ax.legend()
         
         # Plot original data on the second subplot (self.ax2)
         if isinstance(self.data, pd.DataFrame):
-            time_col = self.data.columns[0]
-            x_values = self.data[time_col]
-            
-            for col in self.data.columns[1:]:
-                try:
-                    self.ax2.plot(x_values, self.data[col], label=str(col), color='green', linewidth=1.5)
-                except Exception as e:
-                    logger.error(f"绘制原始数据列 {col} 时出错: {e}")
+            labels = [str(col) for col in self.data.columns[1:]]
         else:
-            x_values = self.data[:, 0]
-            for col in range(1, self.data.shape[1]):
-                self.ax2.plot(x_values, self.data[:, col], label=f"Column {col+1}", color='green', linewidth=1.5)
+            labels = [f"Column {col+1}" for col in range(1, self.data.shape[1])]
+        self._plot_columns(self.ax2, self._data_plot, labels, color='green')
         
         self.ax2.set_xlabel("Time")
         self.ax2.set_ylabel("Signal")
         self.ax2.legend()
-
-    def _basic_plot_vg(self):
-        """Plot the Vg data for visualization and start point selection"""
-        # If vg_data is a DataFrame with named columns
-        if isinstance(self.vg_data, pd.DataFrame):
-            # Use first column as time (x-axis)
-            time_col = self.vg_data.columns[0]
-            x_values = self.vg_data[time_col]
-            
-            # Plot each remaining column against time
-            for col in self.vg_data.columns[1:]:
-                try:
-                    self.ax.plot(x_values, self.vg_data[col], label=f"Vg - {str(col)}")
-                except Exception as e:
-                    logger.error(f"绘制Vg列 {col} 时出错: {e}")
-        else:
-            # Assume numpy array - first column is time
-            x_values = self.vg_data[:, 0]
-            
-            # Plot each remaining column against time
-            for col in range(1, self.vg_data.shape[1]):
-                self.ax.plot(x_values, self.vg_data[:, col], label=f"Vg - Column {col+1}")
-        
-        # Set labels
-        self.ax.set_xlabel("Time")
-        self.ax.set_ylabel("Voltage (Vg)")
-        self.ax.legend()
-
-    def _basic_plot(self):
-        """Basic plotting function for when VibrationDataLoader is not available"""
-        # If data is a DataFrame with named columns
-        if isinstance(self.data, pd.DataFrame):
-            # Use first column as time (x-axis)
-            time_col = self.data.columns[0]
-            x_values = self.data[time_col]
-            
-            # Plot each remaining column against time
-            for col in self.data.columns[1:]:
-                try:
-                    self.ax.plot(x_values, self.data[col], label=str(col))
-                except Exception as e:
-                    logger.error(f"绘制列 {col} 时出错: {e}")
-        else:
-            # Assume numpy array - first column is time
-            x_values = self.data[:, 0]
-            
-            # Plot each remaining column against time
-            for col in range(1, self.data.shape[1]):
-                self.ax.plot(x_values, self.data[:, col], label=f"Column {col+1}")
-        
-        # Set labels
-        self.ax.set_xlabel("Time")
-        self.ax.set_ylabel("Signal")
-        self.ax.legend()
     
+    @staticmethod
+    def _plot_arrays(data):
+        """
+        Display copy of a table: one contiguous float32 row per plottable column (time first),
+        plus the table positions of those columns.
+        Half the bytes of the float64 table for LTTB and Matplotlib's path copies;
+        the full-precision table is kept for trimming and saving.
+        Columns that cannot be converted to numbers are skipped with a warning;
+        returns None when the time column itself is not numeric.
+        """
+        frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame(np.asarray(data))
+        columns = []
+        positions = []
+        for i in range(frame.shape[1]):
+            try:
+                columns.append(frame.iloc[:, i].to_numpy(dtype=np.float32, na_value=np.nan))
+            except (TypeError, ValueError):
+                if i == 0:
+                    logger.warning(f"时间列 {frame.columns[0]} 不是数值，无法绘图")
+                    return None
+                logger.warning(f"列 {frame.columns[i]} 不是数值，已跳过绘图")
+                continue
+            positions.append(i)
+        return np.stack(columns), positions[1:]
+    
+    @classmethod
+    def _display_series(cls, data):
+        """
+        _DisplaySeries of a table: numeric columns 1.. LTTB-downsampled against column 0;
+        None when there is nothing to plot against time.
+        """
+        arrays = cls._plot_arrays(data)
+        if arrays is None or not arrays[1]:
+            return None
+        columns, positions = arrays
+        # Each column keeps its own LTTB samples, so X becomes 2-D with one column per series
+        samples = [_downsample_for_plot(columns[0], y) for y in columns[1:]]
+        xs = np.column_stack([x for x, _ in samples])
+        ys = np.column_stack([y for _, y in samples])
+        time_sorted = bool(np.all(np.diff(columns[0]) >= 0))
+        return _DisplaySeries(xs, ys, positions, columns, time_sorted)
+    
+    def _plot_columns(self, ax, series, labels, color):
+        """
+        Plot a prepared _DisplaySeries with a single Axes.plot call;
+        labels are indexed by table column, starting at column 1
+        """
+        if series is None:
+            return
+        lines = ax.plot(series.xs, series.ys, color=color, linewidth=1.5)
+        for line, position in zip(lines, series.positions):
+            line.set_label(labels[position - 1])
+        self._plot_lines[ax] = [lines, series, (0, series.columns.shape[1])]
+    
+    def _on_xlim_changed(self, ax):
+        """
+        Re-sample the plotted lines for the visible time window.
+        The overview holds _PLOT_POINTS LTTB samples of the whole record; when zoomed in,
+        LTTB runs on the visible samples only, and once no more than _PLOT_POINTS samples
+        are visible they are drawn as they are, so the onset detail is there to click on.
+        """
+        x0, x1 = ax.get_xlim()
+        for entry in self._plot_lines.values():
+            lines, series, window = entry
+            t = series.columns[0]
+            n = t.shape[0]
+            if series.time_sorted:
+                # One sample beyond each edge so the lines run to the border of the axes
+                start = max(int(np.searchsorted(t, x0, side='left')) - 1, 0)
+                stop = min(int(np.searchsorted(t, x1, side='right')) + 1, n)
+            else:
+                start, stop = 0, n
+            # Both axes share x, so this runs once per axes for the same window
+            if (start, stop) == window:
+                continue
+            entry[2] = (start, stop)
+            if (start, stop) == (0, n):
+                for j, line in enumerate(lines):
+                    line.set_data(series.xs[:, j], series.ys[:, j])
+            else:
+                for line, y in zip(lines, series.columns[1:]):
+                    line.set_data(*_downsample_for_plot(t[start:stop], y[start:stop]))
+
     def run(self):
         """Run the main processing workflow"""
         if not self.files_to_process:
@@ -670,6 +1285,9 @@ class StartIdxVisualizedSelect:
         logger.info("键盘快捷键: 'n' = 保存并下一个, 'k' = 跳过")
         plt.ioff()  # Turn off interactive mode for final show
         plt.show()  # This will block until all figures are closed
+        
+        # Drop any outstanding prefetch once the window is closed
+        self._pool.shutdown(wait=False, cancel_futures=True)
 
 
 if __name__ == "__main__":
@@ -1,20 +1,117 @@
+import numpy as np
 import pandas as pd
 import re
+import mmap
+import locale
+from itertools import islice
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from pathlib import Path
 import matplotlib.pyplot as plt
 import os
-import glob
+from concurrent.futures import ProcessPoolExecutor
 import sys
 from loguru import logger
 
+# 可选依赖：pyarrow 提供多线程的CSV解析器，不可用时回退到pandas的C解析器（CSV写出见csv_writer）
+try:
+    import pyarrow  # noqa: F401
+    _CSV_ENGINE = 'pyarrow'
+except ImportError:
+    _CSV_ENGINE = 'c'
+
+try:
+    from .csv_writer import write_csv
+except ImportError:
+    # 作为脚本直接运行时没有父包
+    from csv_writer import write_csv
+
+# 可选依赖：tsdownsample 提供Rust实现的MinMaxLTTB/M4降采样，不可用时使用numpy实现的M4
+try:
+    from tsdownsample import MinMaxLTTBDownsampler, M4Downsampler
+except ImportError:
+    MinMaxLTTBDownsampler = None
+    M4Downsampler = None
+
+# 单位行中的单位格式为"[unit]"
+_UNIT_RE = re.compile(r'\[([^\]]*)\]')
+
+# 表头(列名行, 单位行) -> (列名, 单位元数据, 列类型)，每个进程内缓存
+_SCHEMA_CACHE: Dict[tuple, tuple] = {}
+
+
+def _header_schema(names_line: str, units_line: str) -> tuple:
+    """
+    解析列名行和单位行，结果按表头内容缓存，相同表头的文件不再重复解析
+    
+    参数:
+        names_line: 列名行(制表符分隔)
+        units_line: 单位行(制表符分隔，单位格式为"[unit]")
+        
+    返回:
+        (列名列表, {"<列名> Unit": 单位}, {列名: float64})
+    """
+    key = (names_line, units_line)
+    schema = _SCHEMA_CACHE.get(key)
+    if schema is None:
+        column_names = names_line.split('\t')
+        column_units = {}
+        for name, unit in zip(column_names, units_line.split('\t')):
+            unit_match = _UNIT_RE.search(unit)
+            if unit_match:
+                column_units[f"{name} Unit"] = unit_match.group(1)
+        schema = (column_names, column_units, dict.fromkeys(column_names, np.float64))
+        _SCHEMA_CACHE[key] = schema
+    return schema
+
+
+# 数据行的首字符：数字或负号
+_DATA_LINE_START = frozenset('-0123456789')
+
+
+def _m4_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    M4降采样：把序列分为等长的桶，每个桶保留首、尾、最小值和最大值4个点
+    
+    参数:
+        y: 一维数据
+        n_out: 目标点数(约等于)
+        
+    返回:
+        按时间排序的采样索引，对同长度的序列返回长度相同的结果
+    """
+    n = len(y)
+    n_bins = max(n_out // 4, 1)
+    bin_size = n // n_bins
+    m = n_bins * bin_size
+    starts = np.arange(n_bins) * bin_size
+    blocks = y[:m].reshape(n_bins, bin_size)
+    picks = [starts, starts + blocks.argmin(axis=1), starts + blocks.argmax(axis=1), starts + bin_size - 1]
+    idx = np.stack(picks, axis=1)
+    if m < n:
+        # 不足一个桶的尾部单独作为最后一个桶
+        tail = y[m:]
+        tail_idx = np.array([[m, m + tail.argmin(), m + tail.argmax(), n - 1]])
+        idx = np.concatenate([idx, tail_idx])
+    return np.sort(idx, axis=1).ravel()
+
+
+def _downsample_indices(x: np.ndarray, y: np.ndarray, n_out: int, agg: str) -> np.ndarray:
+    """按 agg("lttb" 或 "m4")选取用于绘图的采样索引"""
+    if agg == "lttb" and MinMaxLTTBDownsampler is not None:
+        return MinMaxLTTBDownsampler().downsample(x, y, n_out=n_out)
+    if agg == "m4" and M4Downsampler is not None:
+        return M4Downsampler().downsample(x, y, n_out=n_out)
+    return _m4_indices(y, n_out)
+
 @dataclass
 class VibrationDataLoader:
     """用于加载和处理振动数据文件的类"""
     metadata: Dict[str, str] = field(default_factory=dict)  # 存储元数据的字典
     data: Optional[pd.DataFrame] = None  # 存储振动数据的DataFrame
     file_path: Optional[str] = None  # 数据文件路径
+    _units_cache: Optional[Dict[str, str]] = field(default=None, init=False, repr=False, compare=False)  # 列单位缓存
+    _display_name: Optional[str] = field(default=None, init=False, repr=False, compare=False)  # 图标题中显示的文件名
     
     def __post_init__(self):
         """初始化后记录初始化信息"""
@@ -33,6 +130,22 @@ class VibrationDataLoader:
         返回:
             包含加载数据和元数据的VibrationDataLoader实例
             
+        异常:
+            FileNotFoundError: 当指定文件不存在时抛出
+            ValueError: 当文件格式无效或异常时抛出
+        """
+        loader = cls()
+        loader._parse_into(file_path)
+        return loader
+    
+    def _parse_into(self, file_path: str) -> None:
+        """
+        从文本文件读取数据到当前实例，覆盖已有的元数据和数据。
+        批量转换时同一个实例可反复用于多个文件。
+        
+        参数:
+            file_path: 包含振动数据的文本文件路径
+            
         异常:
             FileNotFoundError: 当指定文件不存在时抛出
             ValueError: 当文件格式无效或异常时抛出
@@ -43,86 +156,114 @@ class VibrationDataLoader:
             raise FileNotFoundError(f"找不到文件: {file_path}")
         
         logger.info(f"开始加载文件: {file_path}")
-        logger.debug("初始化元数据和数据存储")
         
-        metadata = {}  # 存储元数据
-        data_lines = []  # 存储数据行
-        column_names = []  # 存储列名
+        metadata = self.metadata  # 存储元数据(复用实例上的字典)
+        metadata.clear()
+        self._units_cache = None
+        names_line = None  # 列名行
+        units_line = None  # 单位行
+        units_line_no = None  # 单位行在文件中的行号
         
         try:
-            # 读取文件内容并去除空行
-            logger.debug("读取文件内容")
-            with open(file_path_obj, 'r') as file:
-                lines = [line.strip() for line in file if line.strip()]
-                
-            # 提取元数据(包含':'的行)
-            logger.debug("解析元数据")
-            metadata_end_idx = 0
-            for idx, line in enumerate(lines):
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    metadata[key.strip()] = value.strip()
-                    metadata_end_idx = idx
-                else:
-                    break
-            
-            # 提取列名(元数据后的第一行)
-            header_idx = metadata_end_idx + 1
-            if header_idx >= len(lines):
+            # 只读取文件头部：元数据、列名和单位行，数据区交给read_csv
+            # 通过内存映射在页缓存上查找换行符，只把头部这几行解码为字符串
+            encoding = locale.getpreferredencoding(False)  # 与文本模式open的默认编码一致
+            # 空文件无法建立内存映射(mmap对长度0报错)，按缺少列标题处理
+            if os.path.getsize(file_path_obj) == 0:
                 logger.error("文件格式错误: 缺少列标题")
                 raise ValueError("文件格式错误: 缺少列标题")
+            with open(file_path_obj, 'rb') as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos = 0
+                line_no = -1
+                while pos < len(mm):
+                    end = mm.find(b'\n', pos)
+                    if end == -1:
+                        end = len(mm)
+                    line = mm[pos:end].decode(encoding, errors='replace').strip()
+                    pos = end + 1
+                    line_no += 1
+                    if not line:
+                        continue
+                    if names_line is None:
+                        # 提取元数据(包含':'的行)
+                        if ':' in line:
+                            key, value = line.split(':', 1)
+                            metadata[key.strip()] = value.strip()
+                            continue
+                        # 列名(元数据后的第一行)
+                        names_line = line
+                    else:
+                        # 单位(列名后的一行)
+                        units_line = line
+                        units_line_no = line_no
+                        break
             
-            column_names = lines[header_idx].split('\t')
-            logger.debug(f"检测到列名: {column_names}")
+            if names_line is None:
+                logger.error("文件格式错误: 缺少列标题")
+                raise ValueError("文件格式错误: 缺少列标题")
             
-            # 提取单位(列名后的一行)
-            units_idx = header_idx + 1
-            if units_idx >= len(lines):
+            if units_line is None:
                 logger.error("文件格式错误: 缺少单位行")
                 raise ValueError("文件格式错误: 缺少单位行")
-                
-            column_units = lines[units_idx].split('\t')
-            
-            # 将单位信息存储到元数据中
-            logger.debug("解析单位信息")
-            for i, unit in enumerate(column_units):
-                if i < len(column_names):
-                    unit_match = re.search(r'\[(.*?)\]', unit)
-                    if unit_match:
-                        unit_value = unit_match.group(1)
-                        metadata[f"{column_names[i]} Unit"] = unit_value
-            
-            # 提取数据行(单位行之后的所有行)
-            data_lines = lines[units_idx + 1:]
             
-            # 解析数据行到列表中
-            logger.debug("解析数据行")
-            data_values = []
-            for line in data_lines:
-                # 检查行是否以数字或负号开头(数据行)
-                if line and (line[0].isdigit() or line[0] == '-'):
-                    data_values.append(line.split('\t'))
+            # 同一批采集文件的表头通常完全相同：按表头复用已解析的列名、单位和列类型
+            column_names, column_units, column_dtypes = _header_schema(names_line, units_line)
             
-            # 创建DataFrame
-            logger.debug("创建DataFrame")
-            df = pd.DataFrame(data_values, columns=column_names)
+            # 将单位信息存储到元数据中
+            metadata.update(column_units)
             
-            # 将数值列转换为适当的数据类型
-            logger.debug("转换数据类型")
-            for col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+            # 数据行(单位行之后的所有行)直接交给pandas的解析器，按已知列类型一次得到float64列
+            # pyarrow引擎多线程按列并行解析；C引擎额外使用内存映射读取
+            read_kwargs = dict(sep='\t', skiprows=units_line_no + 1, header=None,
+                               names=column_names, dtype=column_dtypes, engine=_CSV_ENGINE)
+            # C引擎：纯数值数据无需识别NA字符串；出现空字段时转换失败并走下面的回退路径
+            c_kwargs = dict(engine='c', index_col=False, memory_map=True, na_filter=False)
+            if _CSV_ENGINE == 'c':
+                read_kwargs.update(c_kwargs)
+            try:
+                df = pd.read_csv(file_path_obj, **read_kwargs)
+                if df.shape[1] != len(column_names) or not isinstance(df.index, pd.RangeIndex):
+                    # 行尾多余的制表符会多出一个字段，pyarrow引擎把它变成索引使各列错位；
+                    # 该引擎不支持index_col=False，改用C引擎重新解析
+                    logger.debug("数据行字段数与列名不一致，改用C引擎解析: {}", file_path)
+                    read_kwargs.update(c_kwargs)
+                    df = pd.read_csv(file_path_obj, **read_kwargs)
+                # 只含制表符的行：pyarrow引擎得到全NaN行；C引擎(na_filter=False)遇空字段已抛出ValueError走回退路径
+                drop_empty_rows = read_kwargs['engine'] != 'c'
+            except ValueError as e:
+                # 数据区含有非数值行时回退到逐行解析
+                logger.debug("按float64整体解析失败，改为逐行解析: {}", e)
+                # 边读边解析数据行，不保留全部行的中间列表
+                data_values = []
+                append = data_values.append
+                with open(file_path_obj, 'r') as file:
+                    for raw in islice(file, units_line_no + 1, None):
+                        line = raw.strip()
+                        # 检查行是否以数字或负号开头(数据行)
+                        if line and line[0] in _DATA_LINE_START:
+                            append(line.split('\t'))
+                
+                # 创建DataFrame
+                df = pd.DataFrame(data_values, columns=column_names)
+                
+                # 将整张表展平后一次性转换为数值，而不是逐列调用to_numeric
+                values = pd.to_numeric(df.to_numpy(dtype=object).ravel(), errors='coerce')
+                df = pd.DataFrame(np.asarray(values, dtype=np.float64).reshape(df.shape), columns=column_names)
+                drop_empty_rows = True
             
-            # 删除可能由解析错误导致的NaN行
-            df = df.dropna(how='all')
+            # 删除全为NaN的行(解析错误或只含制表符的行)，仅在可能产生这类行的路径上扫描整表；
+            # 以nan或'+'开头的数值行只有逐行路径会按行首字符过滤，整体解析时予以保留
+            if drop_empty_rows:
+                df = df.dropna(how='all')
             
             logger.info(f"成功加载文件: {file_path}")
-            logger.debug(f"数据形状: {df.shape}")
+            # 每个文件只输出一条调试摘要；参数交给loguru按需格式化，未启用DEBUG时不生成字符串
+            logger.debug("数据形状: {} 行 x {} 列, 列名: {}", df.shape[0], df.shape[1], column_names)
             
-            return cls(
-                metadata=metadata,
-                data=df,
-                file_path=str(file_path_obj.resolve())
-            )
+            self.data = df
+            self.file_path = str(file_path_obj.resolve())
+            self._display_name = file_path_obj.name
             
         except Exception as e:
             # 记录异常信息，包含堆栈跟踪
@@ -133,22 +274,31 @@ class VibrationDataLoader:
         """
         从元数据中提取列的单位信息
         
+        结果在首次调用时计算并缓存；直接修改 metadata 或 data 的列后需将 _units_cache 置为 None
+        
         返回:
             将列名映射到其单位的字典
         """
+        if self._units_cache is not None:
+            return self._units_cache
+        
         units = {}
         for key, value in self.metadata.items():
             if key.endswith(" Unit") and key[:-5] in self.data.columns:
                 units[key[:-5]] = value
+        self._units_cache = units
         return units
     
-    def plot_time_series(self, columns: List[str] = None, figsize=(12, 8)):
+    def plot_time_series(self, columns: List[str] = None, figsize=(12, 8),
+                         max_points: Optional[int] = 5000, agg: str = "lttb"):
         """
         将选定列的数据绘制为时间序列图
         
         参数:
             columns: 要绘制的列名列表。如果为None，则绘制所有数值列
             figsize: 图形尺寸，格式为(宽度, 高度)的元组
+            max_points: 每条曲线最多绘制的点数，数据更长时先降采样；为None时绘制全部数据
+            agg: 降采样方法，"lttb"(MinMaxLTTB) 或 "m4"；未安装tsdownsample时均使用numpy实现的M4
             
         返回:
             matplotlib的Figure和Axes对象
@@ -168,9 +318,21 @@ class VibrationDataLoader:
         x_col = self.data.columns[0]  # 假设第一列为时间/x轴
         units = self.get_column_units()
         
-        for col in columns:
-            if col != x_col and col in self.data.columns:
-                ax.plot(self.data[x_col], self.data[col], label=col)
+        # 所有列以二维数组一次绘制，x轴数据只提取一次
+        y_cols = [col for col in columns if col != x_col and col in self.data.columns]
+        if y_cols:
+            x = self.data[x_col].to_numpy()
+            ys = self.data[y_cols].to_numpy()
+            if max_points is not None and len(x) > max_points:
+                # 每列单独选取采样点，各列点数相同，组成二维数组后仍一次绘制
+                idx = np.column_stack([_downsample_indices(x, ys[:, i], max_points, agg)
+                                       for i in range(ys.shape[1])])
+                x = x[idx]
+                ys = np.take_along_axis(ys, idx, axis=0)
+                logger.debug(f"降采样: {len(self.data)} -> {len(idx)} 点/列 ({agg})")
+            lines = ax.plot(x, ys)
+            for line, col in zip(lines, y_cols):
+                line.set_label(col)
         
         # 添加标签和图例
         x_label = f"{x_col}"
@@ -178,14 +340,17 @@ class VibrationDataLoader:
             x_label += f" [{units[x_col]}]"
         ax.set_xlabel(x_label)
         
-        ax.set_title(f"振动数据: {Path(self.file_path).name}")
+        if self._display_name is None:
+            # 直接构造实例(未经from_txt)时按file_path计算一次
+            self._display_name = Path(self.file_path).name
+        ax.set_title(f"振动数据: {self._display_name}")
         ax.grid(True)
         ax.legend()
         
         logger.debug("时间序列图绘制完成")
         return fig, ax
     
-    def to_csv(self, output_path: str = None, include_metadata: bool = False) -> str:
+    def to_csv(self, output_path: str = None, include_metadata: bool = False, _ensure_dir: bool = True) -> str:
         """
         将数据导出为CSV文件
         
@@ -193,6 +358,7 @@ class VibrationDataLoader:
             output_path: 保存CSV文件的路径。如果为None，则使用原始文件名并改为.csv扩展名
             include_metadata: 是否在CSV文件开头包含元数据注释信息。
                             默认为False(不包含元数据注释)
+            _ensure_dir: 是否创建输出目录；批量转换已提前创建好目录时传False
             
         返回:
             保存的CSV文件路径
@@ -211,24 +377,18 @@ class VibrationDataLoader:
         logger.info(f"开始导出数据到: {output_path}")
         
         # 确保目录存在
-        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        if _ensure_dir:
+            os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
         
         try:
+            # 元数据注释(可选)和数据写在同一个文件句柄中，只打开一次
+            metadata_lines = []
             if include_metadata:
                 logger.debug("写入元数据")
-                # 将元数据作为注释写入文件开头
-                with open(output_path, 'w') as f:
-                    for key, value in self.metadata.items():
-                        f.write(f"# {key}: {value}\n")
-                    f.write("\n")  # 元数据后的空行
-                
-                # 将数据追加到文件中
-                logger.debug("追加数据到文件")
-                self.data.to_csv(output_path, mode='a', index=False)
-            else:
-                # 仅写入数据，不包含元数据注释
-                logger.debug("写入数据(不包含元数据)")
-                self.data.to_csv(output_path, index=False)
+                metadata_lines = [f"# {key}: {value}\n" for key, value in self.metadata.items()]
+                metadata_lines.append("\n")  # 元数据后的空行
+            
+            write_csv(self.data, output_path, metadata_lines)
             
             logger.info(f"数据已成功导出到: {output_path}")
             return output_path
@@ -239,7 +399,8 @@ class VibrationDataLoader:
             raise
     
     @staticmethod
-    def convert_txt_to_csv_batch(input_folder: str, output_folder: str, include_metadata: bool = False) -> List[str]:
+    def convert_txt_to_csv_batch(input_folder: str, output_folder: str, include_metadata: bool = False,
+                                 max_workers: Optional[int] = None) -> List[str]:
         """
         将文件夹中的所有TXT格式振动数据文件批量转换为CSV格式。
         
@@ -248,6 +409,7 @@ class VibrationDataLoader:
             output_folder: CSV文件的保存文件夹路径
             include_metadata: 是否在CSV文件中包含元数据注释信息。
                             默认为False(不包含元数据)
+            max_workers: 并行工作进程数，默认为CPU核数
             
         返回:
             已保存的CSV文件路径列表
@@ -256,35 +418,60 @@ class VibrationDataLoader:
         os.makedirs(output_folder, exist_ok=True)
         
         # 查找输入文件夹中的所有txt文件
-        input_files = glob.glob(os.path.join(input_folder, "*.txt"))
+        input_files = [str(path) for path in Path(input_folder).glob("*.txt")]
         logger.info(f"在 {input_folder} 中找到 {len(input_files)} 个txt文件")
         
+        # 各文件相互独立，使用进程池并行转换
+        tasks = [(input_file, output_folder, include_metadata) for input_file in input_files]
         output_files = []
-        for input_file in input_files:
-            try:
-                logger.info(f"开始处理文件: {input_file}")
-                # 加载数据
-                loader = VibrationDataLoader.from_txt(input_file)
-                
-                # 创建输出路径
-                filename = os.path.basename(input_file)
-                output_path = os.path.join(output_folder, os.path.splitext(filename)[0] + ".csv")
-                
-                # 导出为CSV
-                loader.to_csv(output_path, include_metadata)
-                output_files.append(output_path)
-                
-                logger.info(f"成功处理文件: {input_file} -> {output_path}")
-            except Exception as e:
-                logger.error(f"处理 {input_file} 时出错: {str(e)}")
-                # 使用exception方法记录堆栈信息
-                with logger.catch():
-                    raise e
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for output_path in executor.map(_convert_one, tasks, chunksize=4):
+                if output_path is not None:
+                    output_files.append(output_path)
         
         logger.info(f"批处理完成，共处理 {len(output_files)} 个文件")
         return output_files
 
 
+# 工作进程内复用的加载器实例（由 _convert_one 按需创建）
+_WORKER_LOADER: Optional[VibrationDataLoader] = None
+
+
+def _convert_one(args) -> Optional[str]:
+    """
+    转换单个TXT文件为CSV（进程池工作函数）
+    
+    参数:
+        args: (输入文件路径, 输出文件夹, 是否包含元数据)
+        
+    返回:
+        输出CSV文件路径，出错时返回None
+    """
+    global _WORKER_LOADER
+    input_file, output_folder, include_metadata = args
+    try:
+        logger.info(f"开始处理文件: {input_file}")
+        # 加载数据：每个工作进程只创建一个加载器，逐个文件复用
+        if _WORKER_LOADER is None:
+            _WORKER_LOADER = VibrationDataLoader()
+        loader = _WORKER_LOADER
+        loader._parse_into(input_file)
+        
+        # 创建输出路径
+        output_path = str(Path(output_folder) / (Path(input_file).stem + ".csv"))
+        
+        # 导出为CSV
+        # 输出目录已由 convert_txt_to_csv_batch 统一创建
+        loader.to_csv(output_path, include_metadata, _ensure_dir=False)
+        
+        logger.info(f"成功处理文件: {input_file} -> {output_path}")
+        return output_path
+    except Exception:
+        # 一条记录同时包含错误信息和堆栈
+        logger.exception("处理 {} 时出错", input_file)
+        return None
+
+
 if __name__ == "__main__":
     # 配置日志系统
     # logger.remove()  # 移除默认处理器
@@ -293,8 +480,8 @@ if __name__ == "__main__":
     # logger.add("vibration_data.log", rotation="10 MB", level="INFO")  # 文件只记录INFO及以上级别
     logger.configure(
         handlers=[
-            {"sink": sys.stdout, "level": "INFO"},
-            {"sink": "vibration_data_loader.log", "level": "DEBUG", "rotation": "10 MB"},
+            {"sink": sys.stdout, "level": "INFO", "enqueue": True},
+            {"sink": "vibration_data_loader.log", "level": "DEBUG", "rotation": "10 MB", "enqueue": True},
             ]
         )
     # 测试批量处理文件夹
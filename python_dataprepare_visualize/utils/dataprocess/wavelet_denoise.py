@@ -5,8 +5,46 @@ import matplotlib.pyplot as plt
 from typing import Union, List, Optional, Tuple
 from pathlib import Path
 import os
+import functools
+from concurrent.futures import ProcessPoolExecutor
 from loguru import logger
 
+# 可选依赖：pyarrow 提供Parquet写出（CSV写出见csv_writer），parquet输出格式需要它
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    from .csv_writer import write_csv
+except ImportError:
+    # 作为脚本直接运行时没有父包
+    from csv_writer import write_csv
+
+@functools.lru_cache(maxsize=32)
+def _freq_paths(level: int) -> Tuple[str, ...]:
+    """
+    第 level 层全部结点路径，按频率从低到高排列（与 get_level(level, 'freq') 顺序一致）。
+
+    频率顺序即 'a'/'d' 的格雷码顺序，只取决于层数，与小波和数据无关，因此无需构建小波包树。
+    """
+    paths = ['a', 'd']
+    for _ in range(level - 1):
+        paths = ['a' + path for path in paths] + ['d' + path for path in reversed(paths)]
+    return tuple(paths)
+
+
+@functools.lru_cache(maxsize=32)
+def _dropped_paths(level: int, keep_nodes: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    第 level 层中不在 keep_nodes 里的结点路径（需要置零的结点）。
+
+    结果只取决于层数和保留结点，缓存后批量去噪时每次调用无需重新构建集合和逐结点判断。
+    """
+    keep = set(keep_nodes)
+    return tuple(path for path in _freq_paths(level) if path not in keep)
+
+
 class WaveletDenoiser:
     def __init__(self, wavelet: str = 'db4', level: int = 3, keep_nodes: Optional[List[str]] = None):
         """
@@ -18,49 +56,98 @@ class WaveletDenoiser:
             keep_nodes: 需要保留的结点路径，例如 ['aaa', 'aad']
         """
         self.wavelet = wavelet
+        # 缓存小波对象，避免每次分解/重构都按名称重新构建滤波器组
+        self._wavelet_obj = pywt.Wavelet(wavelet)
         self.level = level
         self.keep_nodes = keep_nodes
 
+    def _zero_dropped_nodes(self, wp: pywt.WaveletPacket) -> None:
+        """
+        将不在 keep_nodes 中的结点系数原地置零（第 level 层须已分解）。
+
+        直接修改原分解树上的系数，重构时无需再构建第二棵树或分配全零数组。
+        """
+        if self.keep_nodes is None:
+            return
+        # 需要置零的路径按 (层数, 保留结点) 缓存，只访问被丢弃的结点
+        for path in _dropped_paths(self.level, tuple(self.keep_nodes)):
+            wp[path].data[...] = 0.0
+
     def denoise_signal(self, signal: Union[np.ndarray, pd.Series]) -> np.ndarray:
-        wp = pywt.WaveletPacket(data=signal, wavelet=self.wavelet, mode='symmetric', maxlevel=self.level)
-        all_nodes = [node.path for node in wp.get_level(self.level, 'freq')]
+        wp = pywt.WaveletPacket(data=signal, wavelet=self._wavelet_obj, mode='symmetric', maxlevel=self.level)
+        # get_level 一次性分解整棵树；置零与顺序无关，用 natural 顺序省去按频率排序
+        wp.get_level(self.level, 'natural', decompose=True)
+
+        self._zero_dropped_nodes(wp)
+        return wp.reconstruct(update=False)[:len(signal)]
 
-        new_wp = pywt.WaveletPacket(data=None, wavelet=self.wavelet, mode='symmetric')
-        for path in all_nodes:
-            if self.keep_nodes is None or path in self.keep_nodes:
-                new_wp[path] = wp[path].data
-            else:
-                new_wp[path] = np.zeros_like(wp[path].data)
+    def denoise_signal_batch(self, signals: np.ndarray) -> np.ndarray:
+        """
+        对多条等长信号一次性进行小波包去噪，沿最后一个轴分解。
 
-        return new_wp.reconstruct(update=False)[:len(signal)]
+        参数：
+            signals: 形状为 (信号数, 采样点数) 的二维数组
+
+        返回：
+            与输入形状相同的去噪结果（float32 输入保持 float32）
+        """
+        signals = np.asarray(signals)
+        # pywt 原生支持 float32，仅整数等非浮点输入才转换为 float64，避免单精度数据被翻倍拷贝
+        if not np.issubdtype(signals.dtype, np.floating):
+            signals = signals.astype(float)
+        wp = pywt.WaveletPacket(data=signals, wavelet=self._wavelet_obj, mode='symmetric',
+                                maxlevel=self.level, axis=-1)
+        wp.get_level(self.level, 'natural')
+        self._zero_dropped_nodes(wp)
+        return wp.reconstruct(update=False)[..., :signals.shape[-1]]
 
     def denoise_dataframe(self, df: pd.DataFrame, columns: Optional[List[str]] = None) -> pd.DataFrame:
         df_denoised = df.copy()
         if columns is None:
             columns = df.select_dtypes(include=['number']).columns.tolist()
-        for col in columns:
-            if col in df.columns:
-                df_denoised[col] = self.denoise_signal(df[col].values)
+        columns = [col for col in columns if col in df.columns]
+        if not columns:
+            return df_denoised
+        # 所有列组成 (列数, 采样点数) 的连续矩阵，一棵小波包树沿最后一个轴同时分解全部列
+        # 不强制指定 dtype：全部为 float32 的列保持单精度，分解与重构只需遍历一半内存
+        signals = np.ascontiguousarray(df[columns].to_numpy().T)
+        df_denoised[columns] = self.denoise_signal_batch(signals).T
         return df_denoised
 
-    def denoise_csv_batch(self, input_folder: str, output_folder: str, columns: Optional[List[str]] = None) -> List[str]:
+    def denoise_csv_batch(self, input_folder: str, output_folder: str, columns: Optional[List[str]] = None,
+                          max_workers: Optional[int] = None, output_format: str = 'csv',
+                          read_columns: Optional[List[str]] = None) -> List[str]:
+        """
+        批量去噪文件夹中的CSV文件。
+
+        参数：
+            output_format: 输出格式，'csv'（默认）或 'parquet'（列式存储，体积更小，下游可用 pd.read_parquet 读取）
+            read_columns: 只读取（并写出）这些列，其余列不参与解析；默认读取全部列
+        """
+        if output_format not in ('csv', 'parquet'):
+            raise ValueError(f"不支持的输出格式: {output_format}")
+        if output_format == 'parquet' and pa is None:
+            # 在启动进程池之前检查，避免每个工作进程各自因缺少依赖而失败
+            raise ImportError("输出格式 'parquet' 需要安装 pyarrow")
         os.makedirs(output_folder, exist_ok=True)
         input_files = list(Path(input_folder).glob("*.csv"))
         output_paths = []
+        if not input_files:
+            return output_paths
 
-        for file in input_files:
-            try:
+        # 各文件相互独立，使用进程池并行去噪，日志统一在主进程输出
+        workers = max_workers or os.cpu_count() or 1
+        tasks = [(file, output_folder, self.wavelet, self.level, self.keep_nodes, columns, output_format,
+                  read_columns) for file in input_files]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunksize = max(1, len(tasks) // (4 * workers))
+            for file, output_path, error in executor.map(_denoise_one_file, tasks, chunksize=chunksize):
                 logger.info(f"处理文件: {file}")
-                df = pd.read_csv(file)
-                df_denoised = self.denoise_dataframe(df, columns=columns)
-
-                output_path = Path(output_folder) / file.name
-                df_denoised.to_csv(output_path, index=False)
-                output_paths.append(str(output_path))
-
+                if error is not None:
+                    logger.error(f"处理 {file} 时出错: {error}")
+                    continue
+                output_paths.append(output_path)
                 logger.info(f"保存去噪数据到: {output_path}")
-            except Exception as e:
-                logger.error(f"处理 {file} 时出错: {e}")
 
         return output_paths
 
@@ -99,17 +186,22 @@ class WaveletDenoiser:
         plt.show()
 
     def auto_select_trend_nodes(self, signal: np.ndarray, threshold_ratio: float = 0.1, fs: float = 1.0, plot: str = "bar") -> List[str]:
-        wp = pywt.WaveletPacket(data=signal, wavelet=self.wavelet, mode='symmetric', maxlevel=self.level)
-        nodes = wp.get_level(self.level, order='freq')
+        wp = pywt.WaveletPacket(data=signal, wavelet=self._wavelet_obj, mode='symmetric', maxlevel=self.level)
+        # 结点按 natural 顺序分解，再按缓存的频率顺序路径取出
+        coeffs = {node.path: node.data for node in wp.get_level(self.level, order='natural')}
+        paths = _freq_paths(self.level)
 
-        path_energy = [(node.path, np.sum(np.square(node.data))) for node in nodes]
-        max_energy = max(e for _, e in path_energy)
-        selected = [path for path, energy in path_energy if energy >= threshold_ratio * max_energy]
+        # 同一层各结点系数等长，堆叠为 (结点数, 系数长度) 矩阵后一次算出全部能量(系数平方和)
+        data2d = np.stack([coeffs[path] for path in paths])
+        energies = np.einsum('ij,ij->i', data2d, data2d)
+        # 能量只计算一次，阈值判断得到的布尔掩码供筛选和绘图共用
+        mask = energies >= threshold_ratio * energies.max()
+        selected = [path for path, keep in zip(paths, mask) if keep]
 
         if plot == "bar":
             plt.figure(figsize=(12, 4))
-            for path, energy in path_energy:
-                plt.bar(path, energy, alpha=0.6, color='tab:gray' if path not in selected else 'tab:orange')
+            for path, energy, keep in zip(paths, energies, mask):
+                plt.bar(path, energy, alpha=0.6, color='tab:orange' if keep else 'tab:gray')
             plt.title("小波包路径能量分布")
             plt.ylabel("能量")
             plt.grid(True)
@@ -118,11 +210,11 @@ class WaveletDenoiser:
 
         elif plot == "band":
             plt.figure(figsize=(12, 3))
-            for i, (path, energy) in enumerate(path_energy):
+            for i, (path, keep) in enumerate(zip(paths, mask)):
                 f_start = i / 2**self.level * fs
                 f_end = (i + 1) / 2**self.level * fs
                 plt.barh(0, f_end - f_start, left=f_start, height=0.5,
-                         color='tab:orange' if path in selected else 'tab:gray',
+                         color='tab:orange' if keep else 'tab:gray',
                          edgecolor='black', alpha=0.7)
                 plt.text((f_start + f_end) / 2, 0.1, path, ha='center', va='bottom', fontsize=8)
             plt.xlabel("频率 (Hz)")
@@ -149,3 +241,46 @@ class WaveletDenoiser:
         f_start = node_index / total_nodes * fs
         f_end = (node_index + 1) / total_nodes * fs
         return f_start, f_end
+
+
+def _write_denoised(df: pd.DataFrame, output_path: Path, output_format: str) -> None:
+    """
+    写出去噪结果（Parquet 或 CSV）
+    """
+    if output_format == 'parquet':
+        df.to_parquet(output_path, index=False)
+    else:
+        write_csv(df, output_path)
+
+
+# 工作进程内复用的去噪器（小波滤波器组只构建一次），按配置缓存
+_WORKER_DENOISER: Optional[WaveletDenoiser] = None
+
+
+def _denoise_one_file(args) -> Tuple[Path, Optional[str], Optional[str]]:
+    """
+    对单个CSV文件去噪并保存（进程池工作函数）
+
+    参数：
+        args: (输入文件, 输出文件夹, 小波名称, 分解层数, 保留结点, 需要去噪的列, 输出格式, 需要读取的列)
+
+    返回：
+        (输入文件, 输出路径或None, 错误信息或None)
+    """
+    global _WORKER_DENOISER
+    file, output_folder, wavelet, level, keep_nodes, columns, output_format, read_columns = args
+    try:
+        # 同一批次的任务配置相同：每个工作进程只创建一个去噪器，逐个文件复用
+        denoiser = _WORKER_DENOISER
+        if denoiser is None or (denoiser.wavelet, denoiser.level) != (wavelet, level):
+            denoiser = _WORKER_DENOISER = WaveletDenoiser(wavelet=wavelet, level=level)
+        denoiser.keep_nodes = keep_nodes
+        # usecols 让解析器跳过不需要的列
+        df = pd.read_csv(file, usecols=read_columns)
+        df_denoised = denoiser.denoise_dataframe(df, columns=columns)
+
+        output_path = Path(output_folder) / file.with_suffix('.' + output_format).name
+        _write_denoised(df_denoised, output_path, output_format)
+        return file, str(output_path), None
+    except Exception as e:
+        return file, None, str(e)
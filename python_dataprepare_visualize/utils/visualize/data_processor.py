@@ -1,6 +1,7 @@
 import os
-import glob
 import re
+import struct
+import zipfile
 import numpy as np
 import pandas as pd
 import scipy.interpolate as interp
@@ -9,6 +10,7 @@ from typing import List, Dict, Tuple, Optional, Union
 from pathlib import Path
 import sys
 import argparse
+import functools
 import matplotlib.pyplot as plt
 
 # # 设置日志
@@ -18,6 +20,59 @@ import matplotlib.pyplot as plt
 # )
 # logger = logging.getLogger('DataProcessor')
 
+# 预编译的数字分段正则，供自然排序使用
+_NUM_RE = re.compile(r'(\d+)')
+
+
+@functools.lru_cache(maxsize=None)
+def natural_sort_key(s: str) -> tuple:
+    """自然排序键：按文件名中的数字/非数字分段排序（结果按路径缓存）"""
+    return tuple(int(text) if text.isdigit() else text.lower()
+                 for text in _NUM_RE.split(os.path.basename(s)))
+
+
+def load_npz_memmap(npz_file: str, key: str) -> Optional[np.ndarray]:
+    """
+    以只读内存映射方式打开 .npz 中的一个数组，不把整块数据读入内存。
+
+    save_processed_data 使用 np.savez（不压缩）保存，每个数组在zip中是原样存储的 .npy，
+    因此可直接映射其数据区；访问某一帧时只会读入该帧所在的页。
+    成员被压缩或为object数组时无法映射，返回None，调用方应回退到 np.load。
+
+    Args:
+        npz_file: .npz 文件路径
+        key: 数组名称，例如 'grid_data'
+
+    Returns:
+        np.memmap 或 None
+    """
+    with zipfile.ZipFile(npz_file) as zf:
+        info = zf.getinfo(key + '.npy')
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+
+    with open(npz_file, 'rb') as f:
+        # zip本地文件头：固定30字节，随后是文件名和扩展字段，之后才是 .npy 内容
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        if local_header[:4] != b'PK\x03\x04':
+            return None
+        name_len, extra_len = struct.unpack('<HH', local_header[26:30])
+        f.seek(info.header_offset + 30 + name_len + extra_len)
+
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+
+    if dtype.hasobject:
+        return None
+    return np.memmap(npz_file, dtype=dtype, mode='r', shape=shape,
+                     order='F' if fortran_order else 'C', offset=offset)
+
+
 class DataProcessor:
     """
     处理时间序列数据的类
@@ -41,7 +96,8 @@ class DataProcessor:
             input_folder: 包含CSV文件的输入文件夹路径
             rows: 数据网格的行数
             cols: 数据网格的列数
-            sampling_points: 采样点数量（仅在use_all_points=False时使用）
+            sampling_points: 采样点数量（仅在use_all_points=False时使用）。
+                实际有效帧数不超过最短数据文件的点数，超出部分不会带来额外信息
             use_all_points: 是否使用所有原始数据点而不进行降采样
         """
         self.input_folder = input_folder
@@ -54,6 +110,13 @@ class DataProcessor:
         self.file_paths_grid = None
         self.filename_grid = None
         self.data = {}
+        # 扁平化(SoA)布局：所有单元格的时间/信号依次拼接，offsets[k]:offsets[k+1] 为第k个单元格
+        self._times = None
+        self._signals = None
+        self._offsets = None
+        self._steps = None
+        self._cell_keys = []
+        self._cell_idx = {}
         self.grid_data = None
         self.time_points = None
         self.min_signal = float('inf')
@@ -66,24 +129,24 @@ class DataProcessor:
             logger.info("初始化DataProcessor...")
             self._create_file_grid()
             self._load_data()
+            self._build_flat_layout()
             self._synchronize_time_points()
     
     def _create_file_grid(self):
         """创建文件路径网格，使用自然排序"""
         logger.info(f"从 {self.input_folder} 创建文件网格...")
         
-        # 获取所有CSV文件
-        csv_files = glob.glob(os.path.join(self.input_folder, "*.csv"))
+        # 获取所有CSV文件（单次scandir，跳过隐藏文件，与glob的"*.csv"一致）
+        with os.scandir(self.input_folder) as entries:
+            csv_files = [entry.path for entry in entries
+                         if entry.name.lower().endswith('.csv')
+                         and not entry.name.startswith('.')
+                         and entry.is_file()]
         
         if not csv_files:
             raise ValueError(f"在 {self.input_folder} 中没有找到CSV文件")
         
-        # 自然排序函数
-        def natural_sort_key(s):
-            return [int(text) if text.isdigit() else text.lower() 
-                    for text in re.split(r'(\d+)', os.path.basename(s))]
-        
-        # 排序文件
+        # 排序文件（自然排序）
         csv_files.sort(key=natural_sort_key)
         
         # 初始化空网格
@@ -107,6 +170,9 @@ class DataProcessor:
         """从所有CSV文件加载数据"""
         logger.info("加载数据...")
         
+        # 每个文件的 (最小时间, 最大时间, 最小信号, 最大信号)
+        bounds = []
+        
         for i in range(self.rows):
             for j in range(self.cols):
                 file_path = self.file_paths_grid[i][j]
@@ -140,11 +206,9 @@ class DataProcessor:
                         logger.warning(f"文件 {file_path} 中没有有效数据")
                         continue
                     
-                    # 更新最小/最大值
-                    self.min_time = min(self.min_time, df[time_col].min())
-                    self.max_time = max(self.max_time, df[time_col].max())
-                    self.min_signal = min(self.min_signal, df[signal_col].min())
-                    self.max_signal = max(self.max_signal, df[signal_col].max())
+                    # 记录该文件的最小/最大值，全部加载后统一归约
+                    bounds.append((df[time_col].min(), df[time_col].max(),
+                                   df[signal_col].min(), df[signal_col].max()))
                     
                     # 存储数据
                     self.data[(i, j)] = {
@@ -159,26 +223,74 @@ class DataProcessor:
         
         if not self.data:
             raise ValueError("没有找到有效的数据文件")
+        
+        # 一次性归约所有文件的范围
+        bounds = np.asarray(bounds, dtype=float)
+        self.min_time = float(bounds[:, 0].min())
+        self.max_time = float(bounds[:, 1].max())
+        self.min_signal = float(bounds[:, 2].min())
+        self.max_signal = float(bounds[:, 3].max())
             
         logger.info(f"加载了 {len(self.data)} 个文件的数据")
         logger.info(f"时间范围: {self.min_time:.4f} 到 {self.max_time:.4f}")
         logger.info(f"信号范围: {self.min_signal:.4f} 到 {self.max_signal:.4f}")
     
+    def _build_flat_layout(self):
+        """将各单元格的时间和信号数组拼接为连续的扁平数组"""
+        self._cell_keys = list(self.data.keys())
+        self._cell_idx = {key: k for k, key in enumerate(self._cell_keys)}
+        
+        lengths = [len(self.data[key]['time']) for key in self._cell_keys]
+        self._offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.intp)
+        self._times = np.concatenate([self.data[key]['time'] for key in self._cell_keys])
+        self._signals = np.concatenate([self.data[key]['signal'] for key in self._cell_keys])
+        
+        # self.data 中的数组改为扁平数组的视图，保持原有接口不变
+        # 同时记录每个单元格的均匀采样间隔（非均匀时为NaN）
+        self._steps = np.full(len(self._cell_keys), np.nan)
+        for k, key in enumerate(self._cell_keys):
+            start, end = self._offsets[k], self._offsets[k + 1]
+            self.data[key]['time'] = self._times[start:end]
+            self.data[key]['signal'] = self._signals[start:end]
+            self._steps[k] = self._uniform_step(self._times[start:end])
+    
+    @staticmethod
+    def _uniform_step(time: np.ndarray) -> float:
+        """若时间轴严格递增且等间隔则返回采样间隔，否则返回NaN"""
+        if len(time) < 2:
+            return np.nan
+        steps = np.diff(time)
+        dt = (time[-1] - time[0]) / (len(time) - 1)
+        if dt > 0 and np.allclose(steps, dt, rtol=1e-6, atol=0):
+            return float(dt)
+        return np.nan
+    
+    @staticmethod
+    def _uniform_interp(t0: float, dt: float, signal: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """等间隔时间轴上的线性插值，超出范围时取端点值（与interp1d的fill_value一致）"""
+        pos = (query - t0) / dt
+        i0 = np.clip(np.floor(pos).astype(np.intp), 0, len(signal) - 2)
+        w = np.clip(pos - i0, 0.0, 1.0)
+        return signal[i0] * (1.0 - w) + signal[i0 + 1] * w
+    
+    def _cell_arrays(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """返回第k个单元格的(时间, 信号)视图"""
+        start, end = self._offsets[k], self._offsets[k + 1]
+        return self._times[start:end], self._signals[start:end]
+    
     def _synchronize_time_points(self):
         """假设所有文件时间轴相同，直接使用第一个文件的时间轴"""
         logger.info("同步时间点...")
         
         if self.use_all_points:
             # 取第一个文件的时间轴作为公共时间轴
-            first_key = next(iter(self.data))
-            first_item = self.data[first_key]
-            self.time_points = first_item['time'].copy()
+            self.time_points = self._cell_arrays(0)[0].copy()
             logger.info(f"使用第一个文件的时间轴: {len(self.time_points)} 个时间点")
             
             # 可选：验证其他文件的时间轴是否相同（调试用）
             time_axis_mismatch = False
-            for (i, j), item in self.data.items():
-                if not np.array_equal(item['time'], self.time_points):
+            for k, (i, j) in enumerate(self._cell_keys):
+                if not np.array_equal(self._cell_arrays(k)[0], self.time_points):
                     logger.warning(f"文件 ({i},{j}) 的时间轴与第一个文件不同")
                     time_axis_mismatch = True
             
@@ -187,6 +299,12 @@ class DataProcessor:
             else:
                 logger.warning("⚠ 发现时间轴不一致，建议检查数据")
         else:
+            # 有效帧数：超过最短序列点数的采样只会产生插值出来的冗余帧
+            max_useful = max(1, int(np.diff(self._offsets).min()))
+            if self.sampling_points > max_useful:
+                logger.info(f"采样点数 {self.sampling_points} 超过最短数据长度，调整为 {max_useful}")
+                self.sampling_points = max_useful
+            
             # 创建等间隔的时间点
             self.time_points = np.linspace(self.min_time, self.max_time, self.sampling_points)
             logger.info(f"创建了 {len(self.time_points)} 个等间隔时间点")
@@ -195,18 +313,25 @@ class DataProcessor:
         self.grid_data = np.full((len(self.time_points), self.rows, self.cols), np.nan)
         
         # 直接将信号复制到网格中（无需插值）
-        for (i, j), item in self.data.items():
-            if self.use_all_points and np.array_equal(item['time'], self.time_points):
+        for k, (i, j) in enumerate(self._cell_keys):
+            item = self.data[(i, j)]
+            time, signal = self._cell_arrays(k)
+            if self.use_all_points and np.array_equal(time, self.time_points):
                 # 时间轴相同，直接复制信号
-                self.grid_data[:, i, j] = item['signal']
-                item['interp_signal'] = item['signal']  # 保持兼容性
+                self.grid_data[:, i, j] = signal
+                item['interp_signal'] = signal  # 保持兼容性
+            elif np.isfinite(self._steps[k]):
+                # 等间隔时间轴，直接按索引算术插值
+                interpolated_signal = self._uniform_interp(time[0], self._steps[k], signal, self.time_points)
+                self.grid_data[:, i, j] = interpolated_signal
+                item['interp_signal'] = interpolated_signal
             else:
                 # 时间轴不同或使用采样模式，需要插值
                 f = interp.interp1d(
-                    item['time'], 
-                    item['signal'], 
+                    time, 
+                    signal, 
                     bounds_error=False, 
-                    fill_value=(item['signal'][0], item['signal'][-1])
+                    fill_value=(signal[0], signal[-1])
                 )
                 interpolated_signal = f(self.time_points)
                 self.grid_data[:, i, j] = interpolated_signal
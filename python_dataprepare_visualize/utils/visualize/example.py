@@ -3,17 +3,9 @@
 示例脚本，演示如何使用数据处理和可视化模块
 """
 import os
-from data_processor import DataProcessor
-from visualization_generator import VisualizationGenerator
-from loguru import logger
-import sys
+from log_setup import configure_logging
 
-logger.configure(
-    handlers=[
-        {"sink": sys.stdout, "level": "INFO"},
-        {"sink": "example.log", "level": "DEBUG", "rotation": "10 MB"},
-    ]
-)
+configure_logging("example.log")
 
 # 配置参数
 INPUT_FOLDER = "./output/data2_csv_start-idx-reselected_debiased"
@@ -21,12 +13,19 @@ OUTPUT_FOLDER = "./output/videos"
 ROWS = 6
 COLS = 6
 SAMPLING_POINTS = 500
+# 视频编码速度档位："fast"、"balanced" 或 "quality"，示例中使用较快的balanced
+ENCODING_SPEED = "balanced"
 
 # 确保输出文件夹存在
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
 def process_and_visualize():
     """处理数据并生成可视化"""
+    # 数据处理和可视化模块会连带导入 pandas/scipy/matplotlib，延迟到真正使用时再导入，
+    # 脚本启动和交互提示无需等待
+    from data_processor import DataProcessor
+    from visualization_generator import VisualizationGenerator
+    
     print(f"\n=== 1. 处理数据 ===")
     # 创建数据处理器
     processor = DataProcessor(
@@ -49,7 +48,8 @@ def process_and_visualize():
     viz_gen = VisualizationGenerator(
         processed_data=processed_data,
         colormap="viridis",
-        output_folder=OUTPUT_FOLDER
+        output_folder=OUTPUT_FOLDER,
+        encoding_speed=ENCODING_SPEED
     )
     
     # 生成热图视频
@@ -63,7 +63,8 @@ def process_and_visualize():
     jet_viz_gen = VisualizationGenerator(
         processed_data=processed_data,
         colormap="jet",
-        output_folder=OUTPUT_FOLDER
+        output_folder=OUTPUT_FOLDER,
+        encoding_speed=ENCODING_SPEED
     )
     
     # 生成热图视频
@@ -76,7 +77,8 @@ def process_and_visualize():
     custom_viz_gen = VisualizationGenerator(
         processed_data=processed_data,
         custom_gradient=["#3366FF", "#FF3366"],  # 蓝色到粉红色渐变
-        output_folder=OUTPUT_FOLDER
+        output_folder=OUTPUT_FOLDER,
+        encoding_speed=ENCODING_SPEED
     )
     
     # 生成热图视频
@@ -90,7 +92,8 @@ def process_and_visualize():
     heat_viz_gen = VisualizationGenerator(
         processed_data=processed_data,
         colormap="hot",
-        output_folder=OUTPUT_FOLDER
+        output_folder=OUTPUT_FOLDER,
+        encoding_speed=ENCODING_SPEED
     )
     
     # 生成3D表面视频
@@ -109,7 +112,8 @@ def process_and_visualize():
     coolwarm_viz_gen = VisualizationGenerator(
         processed_data=processed_data,
         colormap="coolwarm",
-        output_folder=OUTPUT_FOLDER
+        output_folder=OUTPUT_FOLDER,
+        encoding_speed=ENCODING_SPEED
     )
     
     # 生成带剖面的热图视频
@@ -167,7 +171,8 @@ def process_and_visualize():
     spectral_viz_gen = VisualizationGenerator(
         processed_data=processed_data,
         colormap="spectral",
-        output_folder=OUTPUT_FOLDER
+        output_folder=OUTPUT_FOLDER,
+        encoding_speed=ENCODING_SPEED
     )
     
     # 生成时间序列的起始、中间和结束时刻的热图
@@ -201,25 +206,30 @@ def load_and_visualize():
     """从保存的处理数据加载并生成可视化"""
     print(f"\n=== 从预处理数据生成可视化 ===")
     
-    # 加载预处理数据
+    # 加载预处理数据（所需模块在此处才导入）
     import numpy as np
+    from data_processor import load_npz_memmap
+    from visualization_generator import VisualizationGenerator
     processed_data_file = os.path.join(OUTPUT_FOLDER, "processed_data.npz")
     
     try:
-        data = np.load(processed_data_file)
+        # 网格数据以只读内存映射打开，按需读入用到的帧；不能映射时才整体读入
+        grid_data = load_npz_memmap(processed_data_file, 'grid_data')
         
-        # 创建处理数据字典
-        processed_data = {
-            'grid_data': data['grid_data'],
-            'time_points': data['time_points'],
-            'min_signal': float(data['min_signal']),
-            'max_signal': float(data['max_signal']),
-            'min_time': float(data['min_time']),
-            'max_time': float(data['max_time']),
-            'rows': int(data['rows']),
-            'cols': int(data['cols']),
-            'data': {}  # 这里简化处理，实际可能需要重建原始数据结构
-        }
+        # with 保证zip文件句柄及时关闭；标量用 .item() 立即取出
+        with np.load(processed_data_file, allow_pickle=False) as data:
+            # 创建处理数据字典
+            processed_data = {
+                'grid_data': data['grid_data'] if grid_data is None else grid_data,
+                'time_points': data['time_points'],
+                'min_signal': data['min_signal'].item(),
+                'max_signal': data['max_signal'].item(),
+                'min_time': data['min_time'].item(),
+                'max_time': data['max_time'].item(),
+                'rows': int(data['rows']),
+                'cols': int(data['cols']),
+                'data': {}  # 这里简化处理，实际可能需要重建原始数据结构
+            }
         
         print(f"已加载预处理数据，形状: {processed_data['grid_data'].shape}")
         
@@ -227,7 +237,8 @@ def load_and_visualize():
         viz_gen = VisualizationGenerator(
             processed_data=processed_data,
             colormap="viridis",
-            output_folder=os.path.join(OUTPUT_FOLDER, "from_processed")
+            output_folder=os.path.join(OUTPUT_FOLDER, "from_processed"),
+            encoding_speed=ENCODING_SPEED
         )
         
         # 生成视频
@@ -1,3 +1,4 @@
+import os
 import numpy as np
 import matplotlib.pyplot as plt
 from pathlib import Path
@@ -132,9 +133,10 @@ def export_filename_grid(metadata, output_path):
         output_path: Path to save the CSV file
     """
     if 'filename_grid' in metadata and metadata['filename_grid'] is not None:
-        with open(output_path, 'w') as f:
-            for row in metadata['filename_grid']:
-                f.write(','.join([str(cell) if cell is not None else '' for cell in row]) + '\n')
+        lines = [','.join([str(cell) if cell is not None else '' for cell in row]) + '\n'
+                 for row in metadata['filename_grid']]
+        with open(os.fspath(output_path), 'w', buffering=1 << 20, encoding='utf-8') as f:
+            f.writelines(lines)
         logger.info(f"文件名网格已导出到 {output_path}")
     else:
         logger.warning("没有可用的文件名网格数据，无法导出")
@@ -0,0 +1,23 @@
+"""
+可视化脚本共用的日志配置
+"""
+import sys
+from loguru import logger
+
+
+def configure_logging(log_file: str, file_level: str = "DEBUG") -> None:
+    """
+    配置控制台(INFO)和按10 MB滚动的文件日志
+
+    enqueue=True：日志写入在后台线程完成，渲染和编码循环不等待控制台/文件I/O
+
+    参数:
+        log_file: 日志文件路径
+        file_level: 文件日志的级别
+    """
+    logger.configure(
+        handlers=[
+            {"sink": sys.stdout, "level": "INFO", "enqueue": True},
+            {"sink": log_file, "level": file_level, "rotation": "10 MB", "enqueue": True},
+        ]
+    )
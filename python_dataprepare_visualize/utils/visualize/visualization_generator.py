@@ -10,9 +10,9 @@ import matplotlib.gridspec as gridspec
 from tqdm import tqdm
 from loguru import logger
 import datetime
+import functools
 from typing import List, Dict, Tuple, Optional, Union
 from pathlib import Path
-import sys
 
 
 # 经典配色方案字典
@@ -68,6 +68,63 @@ elif platform.system() == 'Linux':
 # 修复负号显示问题
 plt.rcParams['axes.unicode_minus'] = False
 
+
+# 编码速度档位 -> libx264 preset；preset 越快编码耗时越短，同等码率下画质略低
+ENCODING_PRESETS = {
+    "fast": "veryfast",
+    "balanced": "medium",
+    "quality": "slow",
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _build_ffmpeg_params(bitrate: str, preset: str = 'slow') -> Tuple[str, ...]:
+    """构建所有视频共用的FFmpeg编码参数（按比特率和preset缓存）"""
+    return (
+        '-vcodec', 'libx264',
+        # '-vcodec', 'h264_nvenc',
+        '-preset', preset,
+        '-profile:v', 'high',
+        # '-level:v', '4.0',
+        '-pix_fmt', 'yuv420p',
+        '-b:v', bitrate,
+        '-maxrate', bitrate,
+        '-bufsize', str(int(bitrate.replace('k', '000')) * 2),
+        # '-threads', '4'
+    )
+
+
+def _progress_callback(i, n):
+    """动画保存进度回调，每10帧输出一次"""
+    if i % 10 == 0:
+        tqdm.write(f'渲染帧 {i}/{n}', end='\r')
+
+
+# 可用配色方案说明文本（静态内容，模块加载时构建一次）
+_COLORMAP_GROUPS = [
+    ("连续数据配色", ["viridis", "plasma", "inferno", "magma", "cividis", "turbo"]),
+    ("经典渐变", ["jet", "rainbow", "ocean", "terrain"]),
+    ("高对比", ["hot", "cool", "copper"]),
+    ("科学数据常用", ["RdBu", "coolwarm", "seismic", "spectral"]),
+    ("单色渐变", ["Blues", "Reds", "Greens", "YlOrRd", "BuPu"]),
+    ("色盲友好方案", ["cividis", "viridis"]),
+]
+COLORMAP_LISTING = "\n".join(
+    ["\n--- 可用的配色方案 ---"]
+    + [f"\n{group}:\n" + "\n".join(f"  - {name}" for name in names) for group, names in _COLORMAP_GROUPS]
+    + [
+        "\n--- 自定义渐变色 ---",
+        "可以提供两个颜色值(RGB或HEX)创建自定义渐变，例如:",
+        "  - ['#FF0000', '#0000FF']  # 红色到蓝色",
+        "  - ['red', 'yellow']       # 红色到黄色",
+        "  - ['#00FF00', '#FF00FF']  # 绿色到粉色",
+        "",
+    ]
+)
+
+# 热图视频单帧的最大单元格数，超过时自动进行空间块平均降采样
+MAX_HEATMAP_CELLS = 200 * 200
+
 class VisualizationGenerator:
     """
     生成高质量的时间序列数据可视化
@@ -88,7 +145,8 @@ class VisualizationGenerator:
                  custom_gradient: List[str] = None,
                  output_folder: str = './output/videos',
                  vmin: float = None,
-                 vmax: float = None):
+                 vmax: float = None,
+                 encoding_speed: str = 'quality'):
         """
         初始化可视化生成器
         
@@ -101,9 +159,14 @@ class VisualizationGenerator:
             output_folder: 视频输出文件夹
             vmin: 颜色映射的最小值，为None时使用数据的最小值
             vmax: 颜色映射的最大值，为None时使用数据的最大值
+            encoding_speed: FFmpeg编码速度档位，"fast"、"balanced" 或 "quality"(默认)，见ENCODING_PRESETS
         """
+        if encoding_speed not in ENCODING_PRESETS:
+            raise ValueError(f"未知的编码速度档位: {encoding_speed}，可选: {list(ENCODING_PRESETS)}")
+        
         # 从处理后的数据中提取所需信息
-        self.grid_data = processed_data['grid_data']
+        # 保证网格数据为C连续数组，使每一帧 grid_data[t] 都是零拷贝的连续视图
+        self.grid_data = np.ascontiguousarray(processed_data['grid_data'])
         self.time_points = processed_data['time_points']
         self.min_signal = processed_data['min_signal']
         self.max_signal = processed_data['max_signal']
@@ -112,6 +175,17 @@ class VisualizationGenerator:
         self.rows = processed_data['rows']
         self.cols = processed_data['cols']
         
+        # 时间轴排序索引只计算一次，之后按时间查找最近帧用二分查找代替逐点扫描
+        time_array = np.asarray(self.time_points)
+        self._tp_order = np.argsort(time_array, kind='stable')
+        self._tp_sorted = np.ascontiguousarray(time_array[self._tp_order])
+        
+        # 所有视频共用的逐帧时间戳文本，预先格式化一次
+        self.time_labels = [f'Time: {t:.4f}' for t in np.asarray(self.time_points).tolist()]
+        
+        # 3D表面图的X和Y坐标网格只依赖网格尺寸，预先创建一次供所有表面图复用
+        self.surface_X, self.surface_Y = np.meshgrid(np.arange(self.cols), np.arange(self.rows))
+        
         # 设置颜色映射范围
         self.vmin = self.min_signal if vmin is None else vmin
         self.vmax = self.max_signal if vmax is None else vmax
@@ -119,6 +193,7 @@ class VisualizationGenerator:
         # 可视化配置
         self.fps = fps
         self.dpi = dpi
+        self.encoding_preset = ENCODING_PRESETS[encoding_speed]
         self.output_folder = output_folder
         
         # 设置色彩映射
@@ -165,6 +240,25 @@ class VisualizationGenerator:
             logger.error(f"检查动画保存选项时出错: {e}")
             logger.error("保存视频可能会失败，请确保已安装必要的依赖")
     
+    def _nearest_frame(self, target_time: float) -> int:
+        """
+        最接近目标时间的帧索引（在预先排序的时间轴上二分查找）
+        
+        Args:
+            target_time: 目标时间点
+        
+        Returns:
+            int: 帧索引
+        """
+        tp = self._tp_sorted
+        pos = int(np.searchsorted(tp, target_time))
+        if pos == len(tp):
+            pos -= 1
+        elif pos > 0 and target_time - tp[pos - 1] <= tp[pos] - target_time:
+            # 与 argmin 一致：距离相同时取较早的时间点
+            pos -= 1
+        return int(self._tp_order[pos])
+    
     def _setup_colormap(self, colormap: str, custom_gradient: List[str] = None) -> str:
         """
         设置颜色映射，支持自定义渐变和预定义的经典配色方案
@@ -207,37 +301,7 @@ class VisualizationGenerator:
     
     def list_available_colormaps(self):
         """列出所有可用的配色方案"""
-        print("\n--- 可用的配色方案 ---")
-        print("\n连续数据配色:")
-        for name in ["viridis", "plasma", "inferno", "magma", "cividis", "turbo"]:
-            print(f"  - {name}")
-        
-        print("\n经典渐变:")
-        for name in ["jet", "rainbow", "ocean", "terrain"]:
-            print(f"  - {name}")
-        
-        print("\n高对比:")
-        for name in ["hot", "cool", "copper"]:
-            print(f"  - {name}")
-        
-        print("\n科学数据常用:")
-        for name in ["RdBu", "coolwarm", "seismic", "spectral"]:
-            print(f"  - {name}")
-        
-        print("\n单色渐变:")
-        for name in ["Blues", "Reds", "Greens", "YlOrRd", "BuPu"]:
-            print(f"  - {name}")
-        
-        print("\n色盲友好方案:")
-        for name in ["cividis", "viridis"]:
-            print(f"  - {name}")
-        
-        print("\n--- 自定义渐变色 ---")
-        print("可以提供两个颜色值(RGB或HEX)创建自定义渐变，例如:")
-        print("  - ['#FF0000', '#0000FF']  # 红色到蓝色")
-        print("  - ['red', 'yellow']       # 红色到黄色")
-        print("  - ['#00FF00', '#FF00FF']  # 绿色到粉色")
-        print("")
+        print(COLORMAP_LISTING)
     
     def generate_heatmap_video(self, 
                               output_file: str = "heatmap_animation.mp4", 
@@ -246,7 +310,8 @@ class VisualizationGenerator:
                               add_colorbar: bool = True,
                               vmin: float = None,
                               vmax: float = None,
-                              bitrate: str = "8000k"):
+                              bitrate: str = "8000k",
+                              frame_downsample: int = None):
         """
         生成热图动画视频
         
@@ -258,6 +323,8 @@ class VisualizationGenerator:
             vmin: 颜色映射的最小值，为None时使用初始化时设置的值
             vmax: 颜色映射的最大值，为None时使用初始化时设置的值
             bitrate: 视频比特率
+            frame_downsample: 空间块平均的块大小，1表示不降采样；
+                              为None时仅在单元格数超过MAX_HEATMAP_CELLS时自动选择
         """
         # grid_data_for_heatmap = np.flip(self.grid_data,axis=0)
 
@@ -291,14 +358,18 @@ class VisualizationGenerator:
             cbar = plt.colorbar(sm, cax=cax)
             cbar.set_label('Swelling (m)')
         
+        # 大网格按块平均降采样，extent保持原始行列坐标以便刻度不变
+        frames_data, extent = self._downsample_frames(frame_downsample)
+        
         # 初始化热图
         im = ax.imshow(
-            self.grid_data[0],
+            frames_data[0],
             cmap=self.colormap,
             norm=norm,
             aspect='equal',
             interpolation='nearest',
-            origin='lower'
+            origin='lower',
+            extent=extent
         )
         
         # 添加标题 - 调整位置以确保显示
@@ -337,11 +408,11 @@ class VisualizationGenerator:
         # 更新函数 - 每一帧调用
         def update(frame):
             # 更新热图数据
-            im.set_array(self.grid_data[frame])
+            im.set_array(frames_data[frame])
             
             # 更新时间戳
             if add_timestamp:
-                time_text.set_text(f'Time: {self.time_points[frame]:.4f}')
+                time_text.set_text(self.time_labels[frame])
             
             return [im] + ([time_text] if add_timestamp else [])
         
@@ -350,7 +421,7 @@ class VisualizationGenerator:
         logger.info(f"创建 {total_frames} 帧的动画...")
         
         # 使用tqdm显示进度条
-        progress_callback = lambda i, n: tqdm.write(f'渲染帧 {i}/{n}', end='\r') if i % 10 == 0 else None
+        progress_callback = _progress_callback
         
         # 创建动画
         anim = animation.FuncAnimation(
@@ -358,18 +429,7 @@ class VisualizationGenerator:
         )
         
         # 设置FFMPEG参数
-        ffmpeg_params = [
-            '-vcodec', 'libx264',
-            # '-vcodec', 'h264_nvenc',
-            '-preset', 'slow',
-            '-profile:v', 'high',
-            # '-level:v', '4.0',
-            '-pix_fmt', 'yuv420p',
-            '-b:v', bitrate,
-            '-maxrate', bitrate,
-            '-bufsize', str(int(bitrate.replace('k', '000')) * 2),
-            # '-threads', '4'
-        ]
+        ffmpeg_params = list(_build_ffmpeg_params(bitrate, self.encoding_preset))
         
         # 保存视频
         output_file = self._save_animation(
@@ -391,6 +451,31 @@ class VisualizationGenerator:
             logger.warning("热图视频保存失败")
             return None
     
+    def _downsample_frames(self, block: int = None):
+        """
+        对网格数据做空间块平均降采样
+        
+        Args:
+            block: 块大小，None时根据MAX_HEATMAP_CELLS自动选择
+            
+        Returns:
+            tuple: (降采样后的帧数据, imshow的extent；未降采样时为None)
+        """
+        if block is None:
+            block = int(np.ceil(np.sqrt(self.rows * self.cols / MAX_HEATMAP_CELLS)))
+        block = min(max(1, int(block)), self.rows, self.cols)
+        if block == 1:
+            return self.grid_data, None
+        
+        # 截掉不足一个块的边缘行列，再reshape后求均值
+        rows = self.rows // block * block
+        cols = self.cols // block * block
+        frames = self.grid_data[:, :rows, :cols].reshape(
+            len(self.time_points), rows // block, block, cols // block, block
+        ).mean(axis=(2, 4))
+        logger.info(f"热图帧按 {block}×{block} 块平均降采样: {self.rows}×{self.cols} -> {frames.shape[1]}×{frames.shape[2]}")
+        return frames, (-0.5, cols - 0.5, -0.5, rows - 0.5)
+    
     def generate_3d_surface_video(self, 
                                  output_file: str = "3d_surface_animation.mp4", 
                                  title: str = "3D Signal Surface Over Time",
@@ -404,7 +489,7 @@ class VisualizationGenerator:
                                  rotation_speed: float = 1.0,
                                  full_rotation: bool = True,
                                  fixed_view: bool = False,
-                                 view_angles: List[Tuple[float, float]] = None,
+                                 view_angles: Union[List[Tuple[float, float]], np.ndarray] = None,
                                  bitrate: str = "8000k"):
         """
         生成3D表面动画视频
@@ -422,7 +507,7 @@ class VisualizationGenerator:
             rotation_speed: 旋转速度倍率 (1.0为标准速度)
             full_rotation: 是否进行完整360度旋转 (False则仅在初始角度附近小幅度旋转)
             fixed_view: 是否使用固定视角（不旋转，优先级高于rotate_view）
-            view_angles: 自定义视角列表，格式为[(elev1, azim1), (elev2, azim2), ...]
+            view_angles: 自定义视角列表，格式为[(elev1, azim1), (elev2, azim2), ...]，或形状为(N, 2)的数组
                          - 如果为None且fixed_view=True，则使用initial_elev和initial_azim
                          - 如果提供且fixed_view=True，则使用指定的视角列表
             bitrate: 视频比特率
@@ -442,10 +527,8 @@ class VisualizationGenerator:
         # 创建子图，并留出标题空间
         ax = fig.add_subplot(111, projection='3d')
         
-        # 创建X和Y坐标网格
-        X = np.arange(self.cols)
-        Y = np.arange(self.rows)
-        X, Y = np.meshgrid(X, Y)
+        # 复用预先创建的X和Y坐标网格
+        X, Y = self.surface_X, self.surface_Y
         
         # 初始化表面
         surf = ax.plot_surface(
@@ -504,18 +587,13 @@ class VisualizationGenerator:
                 # 使用自定义视角列表
                 logger.info(f"使用自定义视角列表，共{len(view_angles)}个视角")
                 
-                # 确保视角列表长度足够，如果不够则重复使用
-                if len(view_angles) < len(self.time_points):
-                    # 计算需要重复的次数
-                    repeat_times = (len(self.time_points) + len(view_angles) - 1) // len(view_angles)
-                    view_angles = view_angles * repeat_times
+                # 视角转为 (N, 2) 数组，帧号对视角数取模即循环使用，无需复制列表
+                angles = np.asarray(view_angles, dtype=float).reshape(-1, 2)
+                angle_idx = np.arange(len(self.time_points)) % len(angles)
                 
-                # 截取所需长度的视角列表
-                view_angles = view_angles[:len(self.time_points)]
-                
-                # 提取仰角和方位角列表
-                elev_range = [angle[0] for angle in view_angles]
-                azim_range = [angle[1] for angle in view_angles]
+                # 按列取出仰角和方位角数组
+                elev_range = angles[angle_idx, 0]
+                azim_range = angles[angle_idx, 1]
             else:
                 # 使用固定的单一视角
                 logger.info(f"使用固定单一视角: elev={initial_elev}, azim={initial_azim}")
@@ -545,9 +623,12 @@ class VisualizationGenerator:
         plt.subplots_adjust(top=0.9)  # 为标题留出更多空间
         
         # 更新函数 - 每一帧调用
+        # 轴标签、范围、刻度和时间戳在动画期间保持不变，每帧只替换表面对象
         def update(frame):
-            # 清除当前表面
-            ax.clear()
+            nonlocal surf
+            
+            # 移除上一帧的表面
+            surf.remove()
             
             # 创建新的表面
             surf = ax.plot_surface(
@@ -559,30 +640,9 @@ class VisualizationGenerator:
                 vmax=vmax
             )
             
-            # 重新设置轴标签
-            ax.set_xlabel('Column')
-            ax.set_ylabel('Row')
-            ax.set_zlabel('Swelling (m)')
-            
-            # 设置轴范围
-            ax.set_xlim(self.cols-1, 0)
-            ax.set_ylim(self.rows-1, 0)
-            # 设置x轴刻度 - 例如只显示4个刻度
-            ax.set_xticks(np.linspace(0, self.cols-1, 6))  # 在x轴范围内均匀分布4个刻度
-            ax.set_xticklabels(np.arange(1,7))  # 对应的标签
-
-            # 设置y轴刻度 - 例如只显示6个刻度
-            ax.set_yticks(np.linspace(0, self.rows-1, 4))  # 在y轴范围内均匀分布6个刻度
-            ax.set_yticklabels(np.arange(2,6))  # 对应的标签
-            ax.set_zlim(vmin, vmax)
-            
-            # 添加时间戳
+            # 更新时间戳
             if add_timestamp:
-                time_text = ax.text2D(
-                    0.02, 0.95, f'Time: {self.time_points[frame]:.4f}',
-                    transform=ax.transAxes, fontsize=12, color='black',
-                    bbox=dict(facecolor='white', alpha=0.5, pad=5)
-                )
+                time_text.set_text(self.time_labels[frame])
             
             # 更新视图角度
             if isinstance(elev_range, (list, np.ndarray)) and isinstance(azim_range, (list, np.ndarray)):
@@ -602,7 +662,7 @@ class VisualizationGenerator:
         logger.info(f"创建 {total_frames} 帧的动画...")
         
         # 使用tqdm显示进度条
-        progress_callback = lambda i, n: tqdm.write(f'渲染帧 {i}/{n}', end='\r') if i % 10 == 0 else None
+        progress_callback = _progress_callback
         
         # 创建动画
         anim = animation.FuncAnimation(
@@ -610,18 +670,7 @@ class VisualizationGenerator:
         )
         
         # 设置FFMPEG参数
-        ffmpeg_params = [
-            '-vcodec', 'libx264',
-            # '-vcodec', 'h264_nvenc',  
-            '-preset', 'slow',
-            '-profile:v', 'high',
-            # '-level:v', '4.0',
-            '-pix_fmt', 'yuv420p',
-            '-b:v', bitrate,
-            '-maxrate', bitrate,
-            '-bufsize', str(int(bitrate.replace('k', '000')) * 2),
-            # '-threads', '4'
-        ]
+        ffmpeg_params = list(_build_ffmpeg_params(bitrate, self.encoding_preset))
         
         # 保存视频
         output_file = self._save_animation(
@@ -774,7 +823,7 @@ class VisualizationGenerator:
             
             # 更新时间戳
             if add_timestamp:
-                time_text.set_text(f'Time: {self.time_points[frame]:.4f}')
+                time_text.set_text(self.time_labels[frame])
             
             return [im, line_top, line_right, time_text] if add_timestamp else [im, line_top, line_right]
         
@@ -783,7 +832,7 @@ class VisualizationGenerator:
         logger.info(f"创建 {total_frames} 帧的动画...")
         
         # 使用tqdm显示进度条
-        progress_callback = lambda i, n: tqdm.write(f'渲染帧 {i}/{n}', end='\r') if i % 10 == 0 else None
+        progress_callback = _progress_callback
         
         # 创建动画
         anim = animation.FuncAnimation(
@@ -791,18 +840,7 @@ class VisualizationGenerator:
         )
         
         # 设置FFMPEG参数
-        ffmpeg_params = [
-            '-vcodec', 'libx264',
-            # '-vcodec', 'h264_nvenc',
-            '-preset', 'slow',
-            '-profile:v', 'high',
-            # '-level:v', '4.0',
-            '-pix_fmt', 'yuv420p',
-            '-b:v', bitrate,
-            '-maxrate', bitrate,
-            '-bufsize', str(int(bitrate.replace('k', '000')) * 2),
-            # '-threads', '8'
-        ]
+        ffmpeg_params = list(_build_ffmpeg_params(bitrate, self.encoding_preset))
         
         # 保存视频
         output_file = self._save_animation(
@@ -876,29 +914,29 @@ class VisualizationGenerator:
         except (ValueError, TypeError) as e:
             logger.warning(f"无法使用ffmpeg，错误: {e}。尝试使用其他视频编码器...")
             
+            # 优先使用ImageMagick管道逐帧写出GIF；Pillow会把所有帧缓存在内存中直到结束
+            gif_writer = 'imagemagick' if animation_module.writers.is_available('imagemagick') else 'pillow'
             try:
-                # 尝试使用pillow
-                logger.info("尝试使用Pillow保存动画...")
-                gif_path = output_path.replace('.mp4', '.gif')  # Pillow通常只支持GIF
+                logger.info(f"尝试使用{gif_writer}保存动画...")
+                gif_path = output_path.replace('.mp4', '.gif')  # 两者均保存为GIF
                 anim.save(
                     gif_path,
-                    writer='pillow',
+                    writer=gif_writer,
                     fps=self.fps,
                     dpi=self.dpi,
                 )
-                logger.info(f"已使用Pillow保存动画为GIF: {gif_path}")
+                logger.info(f"已使用{gif_writer}保存动画为GIF: {gif_path}")
                 return gif_path
             except Exception as e2:
-                logger.error(f"使用Pillow保存动画失败: {e2}")
+                logger.error(f"使用{gif_writer}保存动画失败: {e2}")
                 logger.info("尝试使用其他保存方式...")
                 
                 try:
-                    # 尝试使用HTML保存
+                    # 尝试使用HTML保存，帧逐个写入旁边的帧目录而不是内嵌到HTML中
                     html_path = output_path.replace('.mp4', '.html')
                     anim.save(
                         html_path,
-                        writer='html',
-                        fps=self.fps,
+                        writer=animation_module.HTMLWriter(fps=self.fps, embed_frames=False),
                         dpi=self.dpi
                     )
                     logger.info(f"已保存动画为HTML: {html_path}")
@@ -909,8 +947,8 @@ class VisualizationGenerator:
                     return None
                     
         except Exception as e:
-            logger.error(f"保存动画失败: {e}")
-            logger.error("请确保已正确安装ffmpeg或其他支持的视频编码器")
+            # 单条记录同时带出错误原因和堆栈
+            logger.opt(exception=True).error("保存动画失败: {}，请确保已正确安装ffmpeg或其他支持的视频编码器", e)
             return None
         
     def generate_heatmap_at_time(self,
@@ -953,7 +991,7 @@ class VisualizationGenerator:
         logger.info(f"生成特定时间点的热图: {output_path}, 时间: {target_time:.4f}")
         
         # 找到最接近目标时间的时间点索引
-        nearest_idx = np.abs(self.time_points - target_time).argmin()
+        nearest_idx = self._nearest_frame(target_time)
         actual_time = self.time_points[nearest_idx]
         logger.info(f"找到最接近的时间点: {actual_time:.4f} (索引: {nearest_idx})")
         
@@ -1060,7 +1098,7 @@ class VisualizationGenerator:
         vmax = self.vmax if vmax is None else vmax
         
         # 找到最接近目标时间的时间点索引
-        nearest_idx = np.abs(self.time_points - target_time).argmin()
+        nearest_idx = self._nearest_frame(target_time)
         actual_time = self.time_points[nearest_idx]
         logger.info(f"找到最接近的时间点: {actual_time:.4f} (索引: {nearest_idx})")
         
@@ -1160,10 +1198,8 @@ class VisualizationGenerator:
         fig = plt.figure(figsize=(16, 11), dpi=dpi)
         ax = fig.add_subplot(111, projection='3d')
         
-        # 创建X和Y坐标网格
-        X = np.arange(self.cols)
-        Y = np.arange(self.rows)
-        X, Y = np.meshgrid(X, Y)
+        # 复用预先创建的X和Y坐标网格
+        X, Y = self.surface_X, self.surface_Y
         
         # 绘制3D表面
         surf = ax.plot_surface(
@@ -1283,7 +1319,7 @@ class VisualizationGenerator:
         logger.info(f"生成特定时间点的带剖面热图: {output_path}, 时间: {target_time:.4f}")
         
         # 找到最接近目标时间的时间点索引
-        nearest_idx = np.abs(self.time_points - target_time).argmin()
+        nearest_idx = self._nearest_frame(target_time)
         actual_time = self.time_points[nearest_idx]
         logger.info(f"找到最接近的时间点: {actual_time:.4f} (索引: {nearest_idx})")
         
@@ -1414,9 +1450,8 @@ class VisualizationGenerator:
 # 示例用法
 if __name__ == "__main__":
     # 直接从保存的处理数据创建可视化生成器
-    logger.configure(handlers=[{"sink": sys.stdout, "level": "INFO"},
-                {"sink": "logs/visualization_generator.log", "level": "INFO", "rotation": "10 MB"}
-                ])
+    from log_setup import configure_logging
+    configure_logging("logs/visualization_generator.log", file_level="INFO")
 
     import numpy as np
     